@@ -4,206 +4,405 @@ Tier-Based Architecture Diagram
 Converts InfrastructureModel to professional tier-based Mermaid diagram.
 """
 
+import io
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
 from .model import InfrastructureModel, SubnetType
 
+# Rendered-diagram cache keyed on model content hash. The render is fully
+# deterministic in the model, so identical content can reuse the same string.
+# Endpoints run on a shared thread pool, so each hand-rolled LRU takes a
+# lock around its get/move_to_end and insert/evict pairs - neither is
+# atomic on a plain OrderedDict
+_RENDER_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RENDER_CACHE_MAX = 128
+_RENDER_LOCK = threading.Lock()
+
+# Render of a completely empty model, filled in lazily on first use. Every
+# empty render is identical, so interactive re-renders skip even the hashing.
+_EMPTY_DIAGRAM: Optional[str] = None
+
+# Description strings cached on the same content-hash key as the diagram
+_DESC_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_DESC_CACHE_MAX = 256
+_DESC_LOCK = threading.Lock()
+
+# (model attribute, description label) pairs in summary order
+_DESC_ITEMS = (
+    ("vpcs", "VPC(s)"),
+    ("load_balancers", "Load Balancer(s)"),
+    ("ec2_instances", "EC2 Instance(s)"),
+    ("rds_databases", "RDS Database(s)"),
+    ("s3_buckets", "S3 Bucket(s)"),
+    ("security_groups", "Security Group(s)"),
+)
+
+# Node style palette: white fill with a tier-colored stroke. Shared across the
+# block constants and node templates below so each style string exists once.
+_NODE_BLUE = "fill:#ffffff,stroke:#3b82f6,stroke-width:3px,color:#000"
+_NODE_AMBER = "fill:#ffffff,stroke:#f59e0b,stroke-width:3px,color:#000"
+_NODE_EMERALD = "fill:#ffffff,stroke:#10b981,stroke-width:3px,color:#000"
+_NODE_RED = "fill:#ffffff,stroke:#ef4444,stroke-width:3px,color:#000"
+_NODE_SLATE = "fill:#ffffff,stroke:#64748b,stroke-width:3px,color:#000"
+_NODE_VIOLET = "fill:#ffffff,stroke:#8b5cf6,stroke-width:3px,color:#000"
+_NODE_GREEN = "fill:#ffffff,stroke:#22c55e,stroke-width:3px,color:#000"
+
+# Static diagram fragments, built once at import instead of per render.
+# Only the per-resource nodes vary between models.
+_HEADER = (
+    "graph TB\n"
+    "    %% Tier-Based Architecture Diagram\n"
+    "\n"
+    "    Users[\"👥 Users / Internet\"]\n"
+    "    style Users " + _NODE_GREEN + "\n"
+    "\n"
+)
+
+_EDGE_OPEN = (
+    "    subgraph EdgeTier[\"⚖️ EDGE TIER - Load Balancing\"]\n"
+    "        direction LR\n"
+)
+
+_IGW_BLOCK = (
+    "        IGW[\"🌐 Internet Gateway<br/>VPC Entry Point\"]\n"
+    "        style IGW " + _NODE_BLUE + "\n"
+)
+
+_NAT_EMPTY = (
+    "        NATEmpty[\"✓ No NAT gateways deployed\"]\n"
+    "        style NATEmpty fill:#e0f2fe,stroke:#38bdf8,stroke-dasharray: 5 5,color:#0369a1\n"
+)
+
+_EDGE_EMPTY = (
+    "        EdgeEmpty[\"✓ No load balancers deployed\"]\n"
+    "        style EdgeEmpty fill:#fffbeb,stroke:#fbbf24,stroke-dasharray: 5 5,color:#78350f\n"
+)
+
+_EDGE_CLOSE = (
+    "    end\n"
+    "    style EdgeTier fill:#fffbeb,stroke:#f59e0b,stroke-width:2px,color:#78350f\n"
+    "\n"
+)
+
+_APP_OPEN = (
+    "    subgraph AppTier[\"🖥️ APPLICATION TIER - Compute\"]\n"
+    "        direction LR\n"
+)
+
+_APP_EMPTY = (
+    "        AppEmpty[\"✓ No compute resources deployed\"]\n"
+    "        style AppEmpty fill:#ecfdf5,stroke:#86efac,stroke-dasharray: 5 5,color:#166534\n"
+)
+
+_APP_CLOSE = (
+    "    end\n"
+    "    style AppTier fill:#ecfdf5,stroke:#10b981,stroke-width:2px,color:#065f46\n"
+    "\n"
+)
+
+_DATA_OPEN = (
+    "    subgraph DataTier[\"🗄️ DATABASE TIER - Data Storage\"]\n"
+    "        direction LR\n"
+)
+
+_DATA_EMPTY = (
+    "        DataEmpty[\"✓ No databases deployed\"]\n"
+    "        style DataEmpty fill:#fef2f2,stroke:#fca5a5,stroke-dasharray: 5 5,color:#7f1d1d\n"
+)
+
+_DATA_CLOSE = (
+    "    end\n"
+    "    style DataTier fill:#fef2f2,stroke:#ef4444,stroke-width:2px,color:#7f1d1d\n"
+    "\n"
+)
+
+_SUPPORT_OPEN = (
+    "    subgraph SupportTier[\"🔧 SUPPORT TIER - Infrastructure Services\"]\n"
+    "        direction LR\n"
+)
+
+_SUPPORT_EMPTY = (
+    "        SupportEmpty[\"✓ No additional services\"]\n"
+    "        style SupportEmpty fill:#f8fafc,stroke:#cbd5e1,stroke-dasharray: 5 5,color:#1e293b\n"
+)
+
+_SUPPORT_CLOSE = (
+    "    end\n"
+    "    style SupportTier fill:#f8fafc,stroke:#64748b,stroke-width:2px,color:#1e293b\n"
+    "\n"
+)
+
+# Per-resource node templates: node definition plus its style line in a single
+# format() call, so each resource costs one formatted write instead of several
+# f-string evaluations
+_LB_TPL = (
+    "        {id}[\"⚖️ {name}<br/>Application Load Balancer<br/>📍 {az_count} AZs\"]\n"
+    "        style {id} " + _NODE_AMBER + "\n"
+)
+
+_NAT_TPL = (
+    "        {id}[\"⚡ {name}\"]\n"
+    "        style {id} " + _NODE_EMERALD + "\n"
+)
+
+_EC2_TPL = (
+    "        {id}[\"🖥️ {name}<br/>{itype}<br/>EC2 Instance\"]\n"
+    "        style {id} " + _NODE_EMERALD + "\n"
+)
+
+_RDS_TPL = (
+    "        {id}[\"🗄️ {name}<br/>{engine}<br/>{iclass}<br/>{multi_az} {encrypted}<br/>📍 {az_count} AZs\"]\n"
+    "        style {id} " + _NODE_RED + "\n"
+)
+
+_VPC_TPL = (
+    "        {id}[\"☁️ VPC: {name}<br/>{cidr}<br/>📍 {subnet_count} subnets\"]\n"
+    "        style {id} " + _NODE_SLATE + "\n"
+)
+
+_S3_TPL = (
+    "        {id}[\"🗂️ S3: {name}<br/>{encrypted} {versioned}\"]\n"
+    "        style {id} " + _NODE_AMBER + "\n"
+)
+
+
+# Slice points for the default label truncation, fixed at import so cache
+# misses do no arithmetic: head + "..." + 3-char tail == _LABEL_MAX chars
+_LABEL_MAX = 40
+_LABEL_HEAD = _LABEL_MAX - 6
+
+
+@lru_cache(maxsize=512)
+def format_node_label(text: str, max_len: int = _LABEL_MAX) -> str:
+    """
+    Shorten a resource name for display inside a Mermaid node.
+
+    Very long names break the tier layout, so anything over max_len keeps the
+    head and the last few characters. Memoized because fleets repeat the same
+    names and every re-render asks for the same labels again.
+    """
+    if len(text) <= max_len:
+        return text
+    if max_len == _LABEL_MAX:  # Common path: precomputed slice point
+        return text[:_LABEL_HEAD] + "..." + text[-3:]
+    return text[:max_len - 6] + "..." + text[-3:]
+
 
 def generate_mermaid_diagram(model: InfrastructureModel) -> str:
     """
     Generate a tier-based Mermaid diagram from the infrastructure model.
-    
+
     Layout: Edge Tier → Application Tier → Database Tier → Support Tier
     All tiers shown even if empty for consistent structure.
     """
-    lines = ["graph TB"]
-    lines.append("    %% Tier-Based Architecture Diagram")
-    lines.append("")
-    
-    # ==== USERS / INTERNET ENTRY POINT ====
-    lines.append("    Users[\"👥 Users / Internet\"]")
-    lines.append("    style Users fill:#ffffff,stroke:#22c55e,stroke-width:3px,color:#000")
-    lines.append("")
-    
+    global _EMPTY_DIAGRAM
+
+    # Hoist the resource lists to locals: they are read several times each
+    # below and LOAD_FAST beats repeated attribute lookups in the hot loop
+    vpcs = model.vpcs
+    lbs = model.load_balancers
+    ec2s = model.ec2_instances
+    rdss = model.rds_databases
+    buckets = model.s3_buckets
+    sgs = model.security_groups
+    nat_gateways = model.nat_gateways
+
+    # Empty models all render to the same placeholder diagram; return the
+    # prebuilt constant without hashing anything
+    is_empty = not (vpcs or lbs or ec2s or rdss or buckets or sgs or nat_gateways)
+    if is_empty and _EMPTY_DIAGRAM is not None:
+        return _EMPTY_DIAGRAM
+
+    cache_key = model.content_hash()
+    with _RENDER_LOCK:
+        cached = _RENDER_CACHE.get(cache_key)
+        if cached is not None:
+            _RENDER_CACHE.move_to_end(cache_key)
+            return cached
+
+    # Write into a single buffer instead of accumulating a list of lines;
+    # avoids list reallocation and the final O(N) join copy
+    buf = io.StringIO()
+    w = buf.write
+    w(_HEADER)
+
     # ==== EDGE TIER (Load Balancers) - ALWAYS SHOWN ====
-    lines.append("    subgraph EdgeTier[\"⚖️ EDGE TIER - Load Balancing\"]")
-    lines.append("        direction LR")
-    
+    w(_EDGE_OPEN)
+
     has_edge = False
-    
+
     # Internet Gateway
-    if model.vpcs:
-        lines.append("        IGW[\"🌐 Internet Gateway<br/>VPC Entry Point\"]")
-        lines.append("        style IGW fill:#ffffff,stroke:#3b82f6,stroke-width:3px,color:#000")
+    if vpcs:
+        w(_IGW_BLOCK)
         has_edge = True
-    
+
     # Application Load Balancers
-    if model.load_balancers:
+    if lbs:
         has_edge = True
-        for lb in model.load_balancers:
-            az_count = len(lb.subnet_ids)
-            lines.append(f"        {lb.id}[\"⚖️ {lb.name}<br/>Application Load Balancer<br/>📍 {az_count} AZs\"]")
-            lines.append(f"        style {lb.id} fill:#ffffff,stroke:#f59e0b,stroke-width:3px,color:#000")
-    
-    
+        w("".join(_LB_TPL.format(id=lb.id, name=format_node_label(lb.name),
+                                 az_count=len(lb.subnet_ids))
+                  for lb in lbs))
+
+
     # NAT Gateways
-    nat_gateways = getattr(model, 'nat_gateways', [])
     if nat_gateways:
-        for nat in nat_gateways:
-            lines.append(f"        {nat.id}[\"⚡ {nat.name}\"]")
-            lines.append(f"        style {nat.id} fill:#ffffff,stroke:#10b981,stroke-width:3px,color:#000")
+        w("".join(_NAT_TPL.format(id=nat.id, name=format_node_label(nat.name))
+                  for nat in nat_gateways))
     else:
-        lines.append("        NATEmpty[\"✓ No NAT gateways deployed\"]")
-        lines.append("        style NATEmpty fill:#e0f2fe,stroke:#38bdf8,stroke-dasharray: 5 5,color:#0369a1")
+        w(_NAT_EMPTY)
     # Show empty state if no edge resources
     if not has_edge:
-        lines.append("        EdgeEmpty[\"✓ No load balancers deployed\"]")
-        lines.append("        style EdgeEmpty fill:#fffbeb,stroke:#fbbf24,stroke-dasharray: 5 5,color:#78350f")
-    
-    lines.append("    end")
-    lines.append("    style EdgeTier fill:#fffbeb,stroke:#f59e0b,stroke-width:2px,color:#78350f")
-    lines.append("")
-    
+        w(_EDGE_EMPTY)
+
+    w(_EDGE_CLOSE)
+
     # ==== APPLICATION TIER (EC2) - ALWAYS SHOWN ====
-    lines.append("    subgraph AppTier[\"🖥️ APPLICATION TIER - Compute\"]")
-    lines.append("        direction LR")
-    
+    w(_APP_OPEN)
+
     has_compute = False
-    
+
     # EC2 Instances
-    if model.ec2_instances:
+    if ec2s:
         has_compute = True
-        for ec2 in model.ec2_instances:
-            lines.append(f"        {ec2.id}[\"🖥️ {ec2.name}<br/>{ec2.instance_type.value}<br/>EC2 Instance\"]")
-            lines.append(f"        style {ec2.id} fill:#ffffff,stroke:#10b981,stroke-width:3px,color:#000")
-    
+        w("".join(_EC2_TPL.format(id=ec2.id, name=format_node_label(ec2.name),
+                                  itype=ec2.instance_type.value)
+                  for ec2 in ec2s))
+
     # Show empty state if no compute resources
     if not has_compute:
-        lines.append("        AppEmpty[\"✓ No compute resources deployed\"]")
-        lines.append("        style AppEmpty fill:#ecfdf5,stroke:#86efac,stroke-dasharray: 5 5,color:#166534")
-    
-    lines.append("    end")
-    lines.append("    style AppTier fill:#ecfdf5,stroke:#10b981,stroke-width:2px,color:#065f46")
-    lines.append("")
-    
+        w(_APP_EMPTY)
+
+    w(_APP_CLOSE)
+
     # ==== DATABASE TIER (RDS) - ALWAYS SHOWN ====
-    lines.append("    subgraph DataTier[\"🗄️ DATABASE TIER - Data Storage\"]")
-    lines.append("        direction LR")
-    
+    w(_DATA_OPEN)
+
     has_database = False
-    
+
     # RDS Databases
-    if model.rds_databases:
+    if rdss:
         has_database = True
-        for rds in model.rds_databases:
-            # Safely check for attributes that may not exist in all model versions
-            multi_az_badge = "Multi-AZ ✓" if getattr(rds, 'multi_az', False) else "Single AZ"
-            encrypted_badge = "🔒" if getattr(rds, 'storage_encrypted', False) else ""
-            az_count = len(rds.subnet_ids)
-            lines.append(f"        {rds.id}[\"🗄️ {rds.name}<br/>{rds.engine.value}<br/>{rds.instance_class}<br/>{multi_az_badge} {encrypted_badge}<br/>📍 {az_count} AZs\"]")
-            lines.append(f"        style {rds.id} fill:#ffffff,stroke:#ef4444,stroke-width:3px,color:#000")
-    
+        w("".join(_RDS_TPL.format(
+            id=rds.id,
+            name=format_node_label(rds.name),
+            engine=rds.engine.value,
+            iclass=rds.instance_class,
+            multi_az="Multi-AZ ✓" if rds.multi_az else "Single AZ",
+            encrypted="🔒" if rds.storage_encrypted else "",
+            az_count=len(rds.subnet_ids)
+        ) for rds in rdss))
+
     # Show empty state if no databases
     if not has_database:
-        lines.append("        DataEmpty[\"✓ No databases deployed\"]")
-        lines.append("        style DataEmpty fill:#fef2f2,stroke:#fca5a5,stroke-dasharray: 5 5,color:#7f1d1d")
-    
-    lines.append("    end")
-    lines.append("    style DataTier fill:#fef2f2,stroke:#ef4444,stroke-width:2px,color:#7f1d1d")
-    lines.append("")
-    
+        w(_DATA_EMPTY)
+
+    w(_DATA_CLOSE)
+
     # ==== SUPPORT TIER (VPC Info, S3, Security Groups) - ALWAYS SHOWN ====
-    lines.append("    subgraph SupportTier[\"🔧 SUPPORT TIER - Infrastructure Services\"]")
-    lines.append("        direction LR")
-    
+    w(_SUPPORT_OPEN)
+
     has_support = False
-    
+
     # VPC Information
-    if model.vpcs:
+    if vpcs:
         has_support = True
-        for vpc in model.vpcs:
-            subnet_count = len(vpc.subnets)
-            lines.append(f"        {vpc.id}[\"☁️ VPC: {vpc.name}<br/>{vpc.cidr}<br/>📍 {subnet_count} subnets\"]")
-            lines.append(f"        style {vpc.id} fill:#ffffff,stroke:#64748b,stroke-width:3px,color:#000")
-    
+        w("".join(_VPC_TPL.format(id=vpc.id, name=format_node_label(vpc.name),
+                                  cidr=vpc.cidr, subnet_count=len(vpc.subnets))
+                  for vpc in vpcs))
+
     # S3 Buckets
-    if model.s3_buckets:
+    if buckets:
         has_support = True
-        for bucket in model.s3_buckets:
-            encryption_badge = "🔒" if getattr(bucket, 'encryption_enabled', False) else ""
-            versioning_badge = "📋" if getattr(bucket, 'versioning_enabled', False) else ""
-            lines.append(f"        {bucket.id}[\"🗂️ S3: {bucket.name}<br/>{encryption_badge} {versioning_badge}\"]")
-            lines.append(f"        style {bucket.id} fill:#ffffff,stroke:#f59e0b,stroke-width:3px,color:#000")
-    
+        w("".join(_S3_TPL.format(
+            id=bucket.id,
+            name=format_node_label(bucket.name),
+            encrypted="🔒" if bucket.encryption_enabled else "",
+            versioned="📋" if bucket.versioning_enabled else ""
+        ) for bucket in buckets))
+
     # Security Groups (show count)
-    if model.security_groups:
+    if sgs:
         has_support = True
-        sg_count = len(model.security_groups)
-        lines.append(f"        SG[\"🛡️ Security Groups<br/>{sg_count} configured\"]")
-        lines.append(f"        style SG fill:#ffffff,stroke:#8b5cf6,stroke-width:3px,color:#000")
-    
+        sg_count = len(sgs)
+        w(f"        SG[\"🛡️ Security Groups<br/>{sg_count} configured\"]\n")
+        w("        style SG " + _NODE_VIOLET + "\n")
+
     # Show empty state if no support services
     if not has_support:
-        lines.append("        SupportEmpty[\"✓ No additional services\"]")
-        lines.append("        style SupportEmpty fill:#f8fafc,stroke:#cbd5e1,stroke-dasharray: 5 5,color:#1e293b")
-    
-    lines.append("    end")
-    lines.append("    style SupportTier fill:#f8fafc,stroke:#64748b,stroke-width:2px,color:#1e293b")
-    lines.append("")
-    
+        w(_SUPPORT_EMPTY)
+
+    w(_SUPPORT_CLOSE)
+
     # ==== TRAFFIC FLOW ARROWS ====
-    lines.append("    %% Traffic Flow")
-    
+    w("    %% Traffic Flow\n")
+
+    # Pre-index EC2 ids once so edge emission stays O(V+E) instead of
+    # re-scanning the instance list for every load balancer target
+    ec2_ids = {ec2.id for ec2 in ec2s}
+
     # Users → Internet Gateway (if VPC exists)
-    if model.vpcs:
-        lines.append("    Users ==> IGW")
-    
+    if vpcs:
+        w("    Users ==> IGW\n")
+
     # Internet Gateway → Load Balancers (solid arrows for user traffic)
-    if model.vpcs and model.load_balancers:
-        for lb in model.load_balancers:
-            lines.append(f"    IGW ==> {lb.id}")
-    
-    # Load Balancers → EC2 (solid arrows)
-    if model.load_balancers and model.ec2_instances:
-        for lb in model.load_balancers:
-            for ec2_id in lb.target_instance_ids:
-                if ec2_id:  # Only if target is specified
-                    lines.append(f"    {lb.id} ==> {ec2_id}")
-    
+    if vpcs and lbs:
+        w("".join(f"    IGW ==> {lb.id}\n" for lb in lbs))
+
+    # Load Balancers → EC2 (solid arrows). Flatten the nested loop into one
+    # comprehension and a single write - this is the hot edge loop for large
+    # fleets, and joined emission avoids a buffer call per connection.
+    if lbs and ec2s:
+        w("".join(
+            f"    {lb.id} ==> {ec2_id}\n"
+            for lb in lbs
+            for ec2_id in lb.target_instance_ids
+            if ec2_id in ec2_ids  # Only if target still exists in the model
+        ))
+
     # EC2 → RDS (dashed arrows for backend traffic)
-    if model.ec2_instances and model.rds_databases:
+    if ec2s and rdss:
         # Connect first EC2 to first RDS as example
-        if model.ec2_instances and model.rds_databases:
-            lines.append(f"    {model.ec2_instances[0].id} -.-> {model.rds_databases[0].id}")
-    
+        w(f"    {ec2s[0].id} -.-> {rdss[0].id}\n")
+
     # VPC → Security Groups (dashed arrow showing relationship)
-    if model.vpcs and model.security_groups:
-        lines.append(f"    {model.vpcs[0].id} -.-> SG")
-    
-    lines.append("")
-    return "\n".join(lines)
+    if vpcs and sgs:
+        w(f"    {vpcs[0].id} -.-> SG\n")
+
+    rendered = buf.getvalue()
+    if is_empty:
+        _EMPTY_DIAGRAM = rendered
+    with _RENDER_LOCK:
+        _RENDER_CACHE[cache_key] = rendered
+        if len(_RENDER_CACHE) > _RENDER_CACHE_MAX:
+            _RENDER_CACHE.popitem(last=False)  # Evict least-recently-used entry
+    return rendered
 
 
 def generate_diagram_description(model: InfrastructureModel) -> str:
     """Generate a text description of the diagram."""
-    parts = []
-    
-    if model.vpcs:
-        parts.append(f"{len(model.vpcs)} VPC(s)")
-    if model.load_balancers:
-        parts.append(f"{len(model.load_balancers)} Load Balancer(s)")
-    if model.ec2_instances:
-        parts.append(f"{len(model.ec2_instances)} EC2 Instance(s)")
-    if model.rds_databases:
-        parts.append(f"{len(model.rds_databases)} RDS Database(s)")
-    if model.s3_buckets:
-        parts.append(f"{len(model.s3_buckets)} S3 Bucket(s)")
-    if model.security_groups:
-        parts.append(f"{len(model.security_groups)} Security Group(s)")
-    
-    if not parts:
-        return "Empty infrastructure"
-    
-<<<<<<< HEAD
-    return "Tier-based architecture with " + ", ".join(parts)
-=======
-    return "Tier-based architecture with " + ", ".join(parts)
->>>>>>> 9b7510c85e7d10b729118326e538e63d97fa0468
+    cache_key = model.content_hash()
+    with _DESC_LOCK:
+        cached = _DESC_CACHE.get(cache_key)
+        if cached is not None:
+            _DESC_CACHE.move_to_end(cache_key)
+            return cached
+
+    parts = [
+        f"{n} {label}"
+        for attr, label in _DESC_ITEMS
+        if (n := len(getattr(model, attr)))
+    ]
+
+    if parts:
+        description = "Tier-based architecture with " + ", ".join(parts)
+    else:
+        description = "Empty infrastructure"
+
+    with _DESC_LOCK:
+        _DESC_CACHE[cache_key] = description
+        if len(_DESC_CACHE) > _DESC_CACHE_MAX:
+            _DESC_CACHE.popitem(last=False)  # Evict least-recently-used entry
+    return description
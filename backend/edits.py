@@ -4,42 +4,216 @@ Handles all semantic edit operations on the Infrastructure Model.
 
 This is the ONLY way to modify the model from diagram or Terraform edits.
 All operations:
-1. Apply changes to the model
+1. Apply changes to the model in place (journalled for rollback)
 2. Track edit source to prevent loops
 3. Run security validation
 4. Return validation results
 
+Failed or blocked edits are rolled back via _EditJournal, so callers see
+an unchanged model on failure without the cost of a defensive deepcopy.
+
 Edit Flow:
   Diagram/Terraform → Edit Operation → Model → Security Check → Accept/Reject
 """
 
-from typing import Dict, Any, Optional, List
+import copy
+
+from typing import Callable, Dict, Any, Optional, List
 from .model import (
     InfrastructureModel, VPC, Subnet, EC2Instance, RDSDatabase, LoadBalancer,
     S3Bucket, SecurityGroup, SubnetType, InstanceType, DatabaseEngine, EditSource
 )
 from .security import validate_security, SecurityWarning
-import copy
+
+
+class _EditJournal:
+    """
+    Undo log for in-place edit attempts.
+
+    Edit operations used to deepcopy the entire model up front just so a
+    failed attempt could be discarded. Instead, each mutation records its
+    inverse here as it is applied; rollback() replays the inverses newest
+    first, restoring the model exactly. Cost scales with the size of the
+    edit, not the size of the model.
+    """
+    def __init__(self):
+        self._undo: List[Callable[[], None]] = []
+
+    def appended(self, items: List) -> None:
+        """Record that one item was just appended to `items`"""
+        self._undo.append(items.pop)
+
+    def removed(self, items: List, index: int, item: Any) -> None:
+        """Record that `item` was just removed from `items` at `index`"""
+        self._undo.append(lambda: items.insert(index, item))
+
+    def attr_set(self, obj: Any, name: str, old_value: Any) -> None:
+        """Record the old value of an attribute about to be overwritten"""
+        self._undo.append(lambda: setattr(obj, name, old_value))
+
+    def indexed(self, index: Dict, key: str) -> None:
+        """Record that `key` was just inserted into `index`"""
+        self._undo.append(lambda: index.pop(key, None))
+
+    def unindexed(self, index: Dict, key: str, entry: Any) -> None:
+        """Record that `key` was just deleted from `index`"""
+        self._undo.append(lambda: index.__setitem__(key, entry))
+
+    def rollback(self) -> None:
+        """Revert every recorded mutation, newest first"""
+        while self._undo:
+            self._undo.pop()()
+
+
+# Model list attribute for each indexed resource kind
+_KIND_ATTRS = {
+    "ec2": "ec2_instances",
+    "rds": "rds_databases",
+    "load_balancer": "load_balancers",
+    "s3": "s3_buckets",
+    "security_group": "security_groups",
+}
 
 
 class EditResult:
     """Result of an edit operation"""
     def __init__(self, success: bool, model: Optional[InfrastructureModel], 
-                 warnings: List[SecurityWarning], error: Optional[str] = None):
+                 warnings: Optional[List[SecurityWarning]] = None,
+                 error: Optional[str] = None):
         self.success = success
         self.model = model
-        self.warnings = warnings
+        self.warnings = warnings or []  # Never None, so to_dict needs no branch
         self.error = error
     
     def to_dict(self) -> Dict:
         return {
             "success": self.success,
-            "warnings": [w.to_dict() for w in self.warnings] if self.warnings else [],
+            "warnings": [w.to_dict() for w in self.warnings],
             "error": self.error,
             "model_id": self.model.model_id if self.model else None
         }
 
 
+def _add_ec2(model: InfrastructureModel, properties: Dict[str, Any],
+             journal: _EditJournal) -> Optional[EditResult]:
+    """Add EC2 instance"""
+    default_id = model.next_resource_id("ec2")
+    instance = EC2Instance(
+        id=properties.get("id", default_id),
+        name=properties.get("name", f"instance-{default_id.rsplit('-', 1)[1]}"),
+        instance_type=properties.get("instance_type", "t2.micro"),
+        subnet_id=properties["subnet_id"]  # Required
+    )
+    model.add_ec2(instance)
+    journal.appended(model.ec2_instances)
+    journal.indexed(model._resource_index, instance.id)
+    return None
+
+
+def _add_rds(model: InfrastructureModel, properties: Dict[str, Any],
+             journal: _EditJournal) -> Optional[EditResult]:
+    """Add RDS database"""
+    default_id = model.next_resource_id("rds")
+    database = RDSDatabase(
+        id=properties.get("id", default_id),
+        name=properties.get("name", f"database-{default_id.rsplit('-', 1)[1]}"),
+        engine=properties.get("engine", "postgres"),
+        instance_class=properties.get("instance_class", "db.t3.micro"),
+        subnet_ids=properties["subnet_ids"]  # Required
+    )
+    model.add_rds(database)
+    journal.appended(model.rds_databases)
+    journal.indexed(model._resource_index, database.id)
+    return None
+
+
+def _add_load_balancer(model: InfrastructureModel, properties: Dict[str, Any],
+                       journal: _EditJournal) -> Optional[EditResult]:
+    """Add Load Balancer"""
+    default_id = model.next_resource_id("lb")
+    lb = LoadBalancer(
+        id=properties.get("id", default_id),
+        name=properties.get("name", default_id),
+        subnet_ids=properties["subnet_ids"],  # Required
+        target_instance_ids=properties.get("target_instance_ids", [])
+    )
+    model.add_load_balancer(lb)
+    journal.appended(model.load_balancers)
+    journal.indexed(model._resource_index, lb.id)
+    return None
+
+
+def _add_subnet(model: InfrastructureModel, properties: Dict[str, Any],
+                journal: _EditJournal) -> Optional[EditResult]:
+    """Add subnet to existing VPC"""
+    vpc_id = properties.get("vpc_id")
+    if not vpc_id:
+        return EditResult(False, None, [], "VPC ID required for subnet")
+    
+    vpc = next((v for v in model.vpcs if v.id == vpc_id), None)
+    if not vpc:
+        return EditResult(False, None, [], f"VPC {vpc_id} not found")
+    
+    subnet = Subnet(
+        id=properties.get("id", f"subnet-{len(vpc.subnets) + 1}"),
+        name=properties.get("name", f"subnet-{len(vpc.subnets) + 1}"),
+        cidr=properties["cidr"],  # Required
+        subnet_type=SubnetType(properties.get("type", "private")),
+        availability_zone=properties.get("az", "us-east-1a")
+    )
+    vpc.add_subnet(subnet)
+    journal.appended(vpc.subnets)
+    return None
+
+
+def _add_s3_bucket(model: InfrastructureModel, properties: Dict[str, Any],
+                   journal: _EditJournal) -> Optional[EditResult]:
+    """Add S3 Bucket"""
+    default_id = model.next_resource_id("s3")
+    bucket = S3Bucket(
+        id=properties.get("id", default_id),
+        name=properties.get("name", f"bucket-{default_id.rsplit('-', 1)[1]}"),
+        versioning_enabled=properties.get("versioning_enabled", False),
+        encryption_enabled=properties.get("encryption_enabled", True)
+    )
+    model.add_s3_bucket(bucket)
+    journal.appended(model.s3_buckets)
+    journal.indexed(model._resource_index, bucket.id)
+    return None
+
+
+def _add_security_group(model: InfrastructureModel, properties: Dict[str, Any],
+                        journal: _EditJournal) -> Optional[EditResult]:
+    """Add Security Group"""
+    vpc_id = properties.get("vpc_id", "vpc-main")  # Use existing VPC or default
+    default_id = model.next_resource_id("sg")
+    sg = SecurityGroup(
+        id=properties.get("id", default_id),
+        name=properties.get("name", f"security-group-{default_id.rsplit('-', 1)[1]}"),
+        vpc_id=vpc_id,
+        description=properties.get("description", "Security group"),
+        ingress_rules=properties.get("ingress_rules", []),
+        egress_rules=properties.get("egress_rules", [])
+    )
+    model.add_security_group(sg)
+    journal.appended(model.security_groups)
+    journal.indexed(model._resource_index, sg.id)
+    return None
+
+
+# O(1) dispatch instead of an if/elif chain over resource_type;
+# 'elb' is an accepted alias for 'load_balancer'
+_ADD_DISPATCH = {
+    "ec2": _add_ec2,
+    "rds": _add_rds,
+    "load_balancer": _add_load_balancer,
+    "elb": _add_load_balancer,
+    "subnet": _add_subnet,
+    "s3": _add_s3_bucket,
+    "security_group": _add_security_group,
+}
+
+
 def add_resource(model: InfrastructureModel, resource_type: str, 
                  properties: Dict[str, Any], source: EditSource) -> EditResult:
     """
@@ -50,102 +224,38 @@ def add_resource(model: InfrastructureModel, resource_type: str,
     Security: Validates the new resource doesn't violate policies
     Loop Prevention: Tracks edit source
     """
-    # Create a copy to test changes
-    model_copy = copy.deepcopy(model)
+    handler = _ADD_DISPATCH.get(resource_type)
+    if handler is None:
+        return EditResult(False, None, [], f"Unknown resource type: {resource_type}")
     
+    # Mutate in place, journalling inverses so a rejected edit rolls back
+    # without deepcopying the whole model
+    journal = _EditJournal()
+
     try:
-        if resource_type == "ec2":
-            # Add EC2 instance
-            instance = EC2Instance(
-                id=properties.get("id", f"ec2-{len(model_copy.ec2_instances) + 1}"),
-                name=properties.get("name", f"instance-{len(model_copy.ec2_instances) + 1}"),
-                instance_type=properties.get("instance_type", "t2.micro"),
-                subnet_id=properties["subnet_id"]  # Required
-            )
-            model_copy.add_ec2(instance)
-            
-        elif resource_type == "rds":
-            # Add RDS database
-            database = RDSDatabase(
-                id=properties.get("id", f"rds-{len(model_copy.rds_databases) + 1}"),
-                name=properties.get("name", f"database-{len(model_copy.rds_databases) + 1}"),
-                engine=properties.get("engine", "postgres"),
-                instance_class=properties.get("instance_class", "db.t3.micro"),
-                subnet_ids=properties["subnet_ids"]  # Required
-            )
-            model_copy.add_rds(database)
-            
-        elif resource_type == "load_balancer" or resource_type == "elb":
-            # Add Load Balancer (support both 'load_balancer' and 'elb')
-            lb = LoadBalancer(
-                id=properties.get("id", f"lb-{len(model_copy.load_balancers) + 1}"),
-                name=properties.get("name", f"lb-{len(model_copy.load_balancers) + 1}"),
-                subnet_ids=properties["subnet_ids"],  # Required
-                target_instance_ids=properties.get("target_instance_ids", [])
-            )
-            model_copy.add_load_balancer(lb)
-            
-        elif resource_type == "subnet":
-            # Add subnet to existing VPC
-            vpc_id = properties.get("vpc_id")
-            if not vpc_id:
-                return EditResult(False, None, [], "VPC ID required for subnet")
-            
-            vpc = next((v for v in model_copy.vpcs if v.id == vpc_id), None)
-            if not vpc:
-                return EditResult(False, None, [], f"VPC {vpc_id} not found")
-            
-            subnet = Subnet(
-                id=properties.get("id", f"subnet-{len(vpc.subnets) + 1}"),
-                name=properties.get("name", f"subnet-{len(vpc.subnets) + 1}"),
-                cidr=properties["cidr"],  # Required
-                subnet_type=SubnetType(properties.get("type", "private")),
-                availability_zone=properties.get("az", "us-east-1a")
-            )
-            vpc.add_subnet(subnet)
-            
-        elif resource_type == "s3":
-            # Add S3 Bucket
-            bucket = S3Bucket(
-                id=properties.get("id", f"s3-{len(model_copy.s3_buckets) + 1}"),
-                name=properties.get("name", f"bucket-{len(model_copy.s3_buckets) + 1}"),
-                versioning_enabled=properties.get("versioning_enabled", False),
-                encryption_enabled=properties.get("encryption_enabled", True)
-            )
-            model_copy.add_s3_bucket(bucket)
-            
-        elif resource_type == "security_group":
-            # Add Security Group
-            vpc_id = properties.get("vpc_id", "vpc-main")  # Use existing VPC or default
-            sg = SecurityGroup(
-                id=properties.get("id", f"sg-{len(model_copy.security_groups) + 1}"),
-                name=properties.get("name", f"security-group-{len(model_copy.security_groups) + 1}"),
-                vpc_id=vpc_id,
-                description=properties.get("description", "Security group"),
-                ingress_rules=properties.get("ingress_rules", []),
-                egress_rules=properties.get("egress_rules", [])
-            )
-            model_copy.add_security_group(sg)
-        else:
-            return EditResult(False, None, [], f"Unknown resource type: {resource_type}")
+        error = handler(model, properties, journal)
+        if error is not None:
+            return error
         
-        # Validate security
-        warnings = validate_security(model_copy)
+        # Validate security - only the checks that read the kind just added
+        scope = "load_balancer" if resource_type == "elb" else resource_type
+        warnings = validate_security(model, scope={scope})
         
-        # Check for HIGH severity violations
-        high_severity = [w for w in warnings if w.severity == "HIGH"]
-        if high_severity:
+        # Check for HIGH severity violations - pre-bucketed by the report
+        if warnings.high:
+            journal.rollback()
             return EditResult(
                 False, None, warnings,
-                f"Security violation: {high_severity[0].message}"
+                f"Security violation: {warnings.high[0].message}"
             )
         
         # Update edit tracking
-        model_copy.update_edit_tracking(source)
+        model.update_edit_tracking(source)
         
-        return EditResult(True, model_copy, warnings)
+        return EditResult(True, model, warnings)
         
     except Exception as e:
+        journal.rollback()
         return EditResult(False, None, [], f"Error adding resource: {str(e)}")
 
 
@@ -156,69 +266,40 @@ def remove_resource(model: InfrastructureModel, resource_id: str,
     
     Security: Ensures removal doesn't break dependencies
     """
-    model_copy = copy.deepcopy(model)
-    
+    journal = _EditJournal()
+
     try:
-        # Find and remove the resource
-        removed = False
-        
-        # Check EC2 instances
-        for i, ec2 in enumerate(model_copy.ec2_instances):
-            if ec2.id == resource_id:
-                model_copy.ec2_instances.pop(i)
-                removed = True
-                break
-        
-        # Check RDS databases
-        if not removed:
-            for i, rds in enumerate(model_copy.rds_databases):
-                if rds.id == resource_id:
-                    model_copy.rds_databases.pop(i)
-                    removed = True
-                    break
-        
-        # Check Load Balancers
-        if not removed:
-            for i, lb in enumerate(model_copy.load_balancers):
-                if lb.id == resource_id:
-                    model_copy.load_balancers.pop(i)
-                    removed = True
-                    break
-        
-        # Check S3 Buckets
-        if not removed:
-            for i, bucket in enumerate(model_copy.s3_buckets):
-                if bucket.id == resource_id:
-                    model_copy.s3_buckets.pop(i)
-                    removed = True
-                    break
-        
-        # Check Security Groups
-        if not removed:
-            for i, sg in enumerate(model_copy.security_groups):
-                if sg.id == resource_id:
-                    model_copy.security_groups.pop(i)
-                    removed = True
-                    break
-        
-        if not removed:
+        # Resolve the resource in O(1) via the model's id index
+        entry = model.get_resource_by_id(resource_id)
+        if entry is None:
             return EditResult(False, None, [], f"Resource {resource_id} not found")
+        removed_kind, resource = entry
+        
+        resources = getattr(model, _KIND_ATTRS[removed_kind])
+        i = next(i for i, r in enumerate(resources) if r is resource)
+        resources.pop(i)
+        journal.removed(resources, i, resource)
+        del model._resource_index[resource_id]
+        journal.unindexed(model._resource_index, resource_id, entry)
         
         # CRITICAL FIX: Clean up dangling references to deleted resource
         # If we deleted an EC2 instance, remove it from load balancer targets
-        for lb in model_copy.load_balancers:
+        for lb in model.load_balancers:
             if resource_id in lb.target_instance_ids:
-                lb.target_instance_ids.remove(resource_id)
+                i = lb.target_instance_ids.index(resource_id)
+                lb.target_instance_ids.pop(i)
+                journal.removed(lb.target_instance_ids, i, resource_id)
         
-        # Validate security (might expose new issues)
-        warnings = validate_security(model_copy)
+        # Validate security (might expose new issues with the removed kind)
+        warnings = validate_security(model, scope={removed_kind})
         
         # Update edit tracking
-        model_copy.update_edit_tracking(source)
+        model.update_edit_tracking(source)
         
-        return EditResult(True, model_copy, warnings)
+        return EditResult(True, model, warnings)
         
     except Exception as e:
+        journal.rollback()
         return EditResult(False, None, [], f"Error removing resource: {str(e)}")
 
 
@@ -230,56 +311,73 @@ def move_resource(model: InfrastructureModel, resource_id: str,
     Security: Critical check - prevents moving DBs to public subnets
     Common use case: Moving EC2 between public/private subnets
     """
-    model_copy = copy.deepcopy(model)
-    
+    journal = _EditJournal()
+
     try:
         # Verify target subnet exists
-        target_subnet = model_copy.get_subnet_by_id(target_subnet_id)
+        target_subnet = model.get_subnet_by_id(target_subnet_id)
         if not target_subnet:
             return EditResult(False, None, [], f"Target subnet {target_subnet_id} not found")
         
-        moved = False
-        
-        # Move EC2 instance
-        for ec2 in model_copy.ec2_instances:
-            if ec2.id == resource_id:
-                ec2.subnet_id = target_subnet_id
-                moved = True
-                break
-        
-        # Move RDS (update subnet_ids)
-        if not moved:
-            for rds in model_copy.rds_databases:
-                if rds.id == resource_id:
-                    # For RDS, we need to maintain multi-AZ, so add to subnet list
-                    if target_subnet_id not in rds.subnet_ids:
-                        rds.subnet_ids = [target_subnet_id] + rds.subnet_ids[:1]  # Keep 2 subnets
-                    moved = True
-                    break
-        
-        if not moved:
+        # Resolve the resource in O(1); only EC2 and RDS are movable
+        entry = model.get_resource_by_id(resource_id)
+        if entry is None or entry[0] not in ("ec2", "rds"):
             return EditResult(False, None, [], f"Resource {resource_id} not found. It may have been deleted.")
+        moved_kind, resource = entry
+        
+        if moved_kind == "ec2":
+            journal.attr_set(resource, "subnet_id", resource.subnet_id)
+            resource.subnet_id = target_subnet_id
+        else:
+            # For RDS, we need to maintain multi-AZ, so add to subnet list
+            if target_subnet_id not in resource.subnet_ids:
+                journal.attr_set(resource, "subnet_ids", resource.subnet_ids)
+                resource.subnet_ids = [target_subnet_id] + resource.subnet_ids[:1]  # Keep 2 subnets
         
-        # CRITICAL: Validate security after move
-        warnings = validate_security(model_copy)
+        # CRITICAL: Validate security after move, scoped to the moved kind
+        warnings = validate_security(model, scope={moved_kind})
         
         # Block HIGH severity violations (e.g., DB in public subnet)
-        high_severity = [w for w in warnings if w.severity == "HIGH"]
-        if high_severity:
+        if warnings.high:
+            journal.rollback()
             return EditResult(
                 False, None, warnings,
-                f"Move blocked: {high_severity[0].message}"
+                f"Move blocked: {warnings.high[0].message}"
             )
         
         # Update edit tracking
-        model_copy.update_edit_tracking(source)
+        model.update_edit_tracking(source)
         
-        return EditResult(True, model_copy, warnings)
+        return EditResult(True, model, warnings)
         
     except Exception as e:
+        journal.rollback()
         return EditResult(False, None, [], f"Error moving resource: {str(e)}")
 
 
+# Whitelist of editable properties per resource kind, and the labels used
+# in rejection messages. IDs and names stay blocked (would break references)
+_SAFE_PROPERTIES = {
+    "ec2": ["instance_type"],
+    "rds": ["instance_class", "allocated_storage"],
+    "load_balancer": ["target_instance_ids"]
+}
+
+# Enum-typed properties must be coerced before assignment: __post_init__
+# coercion only runs at construction, and a raw string stored here would
+# poison the shared in-store model (renders read .value). An invalid value
+# raises ValueError inside the journalled block and rolls back cleanly.
+_PROPERTY_COERCIONS = {
+    ("ec2", "instance_type"): InstanceType,
+}
+
+_KIND_LABELS = {
+    "ec2": "EC2",
+    "rds": "RDS",
+    "load_balancer": "Load Balancer",
+}
+
+
 def update_resource_property(model: InfrastructureModel, resource_id: str,
                              property_name: str, value: Any, 
                              source: EditSource) -> EditResult:
@@ -293,61 +391,70 @@ def update_resource_property(model: InfrastructureModel, resource_id: str,
     
     Blocked properties: IDs, names (would break references)
     """
-    model_copy = copy.deepcopy(model)
+    # Resolve the target in O(1); rollback scope is a single attribute, so
+    # no copy of any kind is needed
+    entry = model.get_resource_by_id(resource_id)
+    if entry is None or entry[0] not in _SAFE_PROPERTIES:
+        return EditResult(False, None, [], f"Resource {resource_id} not found")
+    kind, target = entry
+    
+    if property_name not in _SAFE_PROPERTIES[kind]:
+        return EditResult(False, None, [], 
+                        f"Property {property_name} is not editable for {_KIND_LABELS[kind]}")
     
-    # Whitelist of editable properties
-    SAFE_PROPERTIES = {
-        "ec2": ["instance_type"],
-        "rds": ["instance_class", "allocated_storage"],
-        "load_balancer": ["target_instance_ids"]
-    }
+    journal = _EditJournal()
     
     try:
-        updated = False
-        
-        # Update EC2
-        for ec2 in model_copy.ec2_instances:
-            if ec2.id == resource_id:
-                if property_name not in SAFE_PROPERTIES["ec2"]:
-                    return EditResult(False, None, [], 
-                                    f"Property {property_name} is not editable for EC2")
-                if property_name == "instance_type":
-                    ec2.instance_type = value  # String, will be converted by __post_init__
-                updated = True
-                break
-        
-        # Update RDS
-        if not updated:
-            for rds in model_copy.rds_databases:
-                if rds.id == resource_id:
-                    if property_name not in SAFE_PROPERTIES["rds"]:
-                        return EditResult(False, None, [], 
-                                        f"Property {property_name} is not editable for RDS")
-                    setattr(rds, property_name, value)
-                    updated = True
-                    break
-        
-        # Update Load Balancer
-        if not updated:
-            for lb in model_copy.load_balancers:
-                if lb.id == resource_id:
-                    if property_name not in SAFE_PROPERTIES["load_balancer"]:
-                        return EditResult(False, None, [], 
-                                        f"Property {property_name} is not editable for Load Balancer")
-                    setattr(lb, property_name, value)
-                    updated = True
-                    break
-        
-        if not updated:
-            return EditResult(False, None, [], f"Resource {resource_id} not found")
+        coerce = _PROPERTY_COERCIONS.get((kind, property_name))
+        if coerce is not None and not isinstance(value, coerce):
+            value = coerce(value)  # ValueError on invalid input -> rollback
+        journal.attr_set(target, property_name, getattr(target, property_name))
+        setattr(target, property_name, value)
         
-        # Validate security
-        warnings = validate_security(model_copy)
+        # Validate security - only the checks reading the updated kind
+        warnings = validate_security(model, scope={kind})
         
         # Update edit tracking
-        model_copy.update_edit_tracking(source)
+        model.update_edit_tracking(source)
         
-        return EditResult(True, model_copy, warnings)
+        return EditResult(True, model, warnings)
         
     except Exception as e:
+        journal.rollback()
         return EditResult(False, None, [], f"Error updating property: {str(e)}")
+
+
+def apply_operations(model: InfrastructureModel, operations: List[Dict[str, Any]],
+                     source: EditSource) -> EditResult:
+    """
+    Apply a parsed batch of edit operations as one transaction.
+
+    This is the Terraform edit path: the parser diffs the old and new code
+    into operation dicts, and this applies them in order as one batch.
+    Operations run against a private copy of the model, so the first
+    failed operation discards the copy and returns that result with the
+    caller's model - and anything stored under its id - untouched; no
+    prefix of a failed batch ever leaks. On success the returned result
+    carries the edited copy and every operation's security warnings in
+    application order; callers swap the copy in for the original.
+    """
+    working = copy.deepcopy(model)
+    all_warnings: List[SecurityWarning] = []
+    for op in operations:
+        operation = op.get('operation')
+        if operation == 'update_resource_property':
+            result = update_resource_property(working, op['resource_id'],
+                                              op['property'], op['value'], source)
+        elif operation == 'move_resource':
+            result = move_resource(working, op['resource_id'],
+                                   op['target_subnet_id'], source)
+        elif operation == 'remove_resource':
+            result = remove_resource(working, op['resource_id'], source)
+        else:
+            continue
+
+        if not result.success:
+            return result
+        all_warnings.extend(result.warnings)
+
+    return EditResult(True, working, all_warnings)
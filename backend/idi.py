@@ -3,14 +3,65 @@ Infrastructure Decision Intelligence (IDI)
 Generates decision cards explaining WHY architectural choices were made.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from .model import InfrastructureModel, SubnetType
+import logging
+import threading
+from bisect import bisect_left
+from sys import intern
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Tuple, TypedDict
+from .model import InfrastructureModel, InstanceType, SubnetType
 
+# Reports cached on the model content hash, same pattern as the diagram
+# renderer: identical content always produces an identical report
+_REPORT_CACHE: "OrderedDict[str, DecisionReport]" = OrderedDict()
+_REPORT_CACHE_MAX = 128
+_REPORT_LOCK = threading.Lock()  # Endpoints share a thread pool; LRU ops aren't atomic
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+# camelCase keys of the serialized card, in field order
+_CARD_KEYS = ("id", "title", "why", "riskReduced", "riskLevel",
+              "tradeoff", "costImpact", "confidence")
+
+
+class CardDict(TypedDict):
+    """Serialized shape of a DecisionCard - the wire format is frozen."""
+    id: str
+    title: str
+    why: str
+    riskReduced: str
+    riskLevel: str
+    tradeoff: str
+    costImpact: str
+    confidence: str
+
+
+class ReportDict(TypedDict):
+    """Serialized shape of a DecisionReport."""
+    decisions: List[CardDict]
+    totalMonthlyCostEstimate: str
+    architectureComplexity: str
+    costBreakdown: List[str]
+
+
+# Risk/confidence labels shared by most cards; interned so every card holds
+# the same string object instead of a fresh copy per construction
+_LOW = intern("Low")
+_MEDIUM = intern("Medium")
+_HIGH = intern("High")
+
+
+@dataclass(frozen=True, slots=True)
 class DecisionCard:
-    """Represents a single architectural decision with rationale and impact."""
+    """
+    Represents a single architectural decision with rationale and impact.
+
+    Frozen so prototype cards can be shared across reports and cached
+    without defensive copies; variants are derived with dataclasses.replace.
+    """
     id: str
     title: str
     why: str
@@ -20,17 +71,10 @@ class DecisionCard:
     cost_impact: str
     confidence: str  # "Low" | "Medium" | "High"
     
-    def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "title": self.title,
-            "why": self.why,
-            "riskReduced": self.risk_reduced,
-            "riskLevel": self.risk_level,
-            "tradeoff": self.tradeoff,
-            "costImpact": self.cost_impact,
-            "confidence": self.confidence
-        }
+    def to_dict(self) -> CardDict:
+        return dict(zip(_CARD_KEYS, (
+            self.id, self.title, self.why, self.risk_reduced, self.risk_level,
+            self.tradeoff, self.cost_impact, self.confidence)))
 
 
 @dataclass
@@ -41,7 +85,7 @@ class DecisionReport:
     architecture_complexity: str = "Simple"
     cost_breakdown: List[str] = field(default_factory=list)
     
-    def to_dict(self) -> Dict:
+    def to_dict(self) -> ReportDict:
         return {
             "decisions": [d.to_dict() for d in self.decisions],
             "totalMonthlyCostEstimate": self.total_monthly_cost_estimate,
@@ -56,254 +100,364 @@ def generate_decision_intelligence(model: InfrastructureModel) -> DecisionReport
     
     This is rule-based and deterministic - no LLM required.
     """
-    print("🎯 [IDI] Generating decision intelligence...")
-    
-    report = DecisionReport()
-    
-    # Detect all architectural decisions
-    report.decisions = detect_decisions(model)
-    
-    # Calculate cost estimates
-    cost_data = estimate_monthly_cost(model)
-    report.total_monthly_cost_estimate = cost_data["total"]
-    report.cost_breakdown = cost_data["breakdown"]
+    cache_key = model.content_hash()
+    with _REPORT_LOCK:
+        cached = _REPORT_CACHE.get(cache_key)
+        if cached is not None:
+            _REPORT_CACHE.move_to_end(cache_key)
+            return cached
+
+    logger.debug("[IDI] Generating decision intelligence...")
     
-    # Determine architecture complexity
-    report.architecture_complexity = determine_complexity(model)
+    report = _analyze(model)
     
-    print(f"✅ [IDI] Generated {len(report.decisions)} decision cards")
+    logger.debug("[IDI] Generated %d decision cards", len(report.decisions))
     
+    with _REPORT_LOCK:
+        _REPORT_CACHE[cache_key] = report
+        if len(_REPORT_CACHE) > _REPORT_CACHE_MAX:
+            _REPORT_CACHE.popitem(last=False)  # Evict least-recently-used entry
     return report
 
 
-def detect_decisions(model: InfrastructureModel) -> List[DecisionCard]:
-    """Detect architectural decisions from infrastructure model."""
-    decisions = []
-    
-    # Helper: Check if resource is in private subnet
-    def is_in_private_subnet(subnet_id: str) -> bool:
-        subnet = model.get_subnet_by_id(subnet_id)
-        return subnet and subnet.subnet_type == SubnetType.PRIVATE
-    
-    # Decision 1: EC2 in Private Subnet
-    private_ec2 = [ec2 for ec2 in model.ec2_instances if is_in_private_subnet(ec2.subnet_id)]
-    if private_ec2:
-        decisions.append(DecisionCard(
-            id="private-subnet-ec2",
-            title="EC2 Instances in Private Subnet",
-            why="Reduces public attack surface by isolating compute resources from direct internet access. Only the load balancer is exposed publicly.",
-            risk_reduced="Prevents direct exploitation of application vulnerabilities and unauthorized access to compute instances",
-            risk_level="High",
-            tradeoff="Requires NAT Gateway for outbound internet access (updates, external APIs)",
-            cost_impact="+$32/month (NAT Gateway)",
-            confidence="High (industry best practice)"
-        ))
-    
-    # Decision 2: Load Balancer
-    if model.load_balancers:
-        lb_count = len(model.load_balancers)
-        decisions.append(DecisionCard(
-            id="load-balancer",
-            title=f"Application Load Balancer{'s' if lb_count > 1 else ''} Added",
-            why="Enables horizontal scalability, fault tolerance, SSL termination, and distributes traffic across multiple instances",
-            risk_reduced="Improves availability and prevents single point of failure",
-            risk_level="Medium",
-            tradeoff="Increased complexity and additional component to manage",
-            cost_impact=f"+${lb_count * 18}/month (ALB base cost)",
-            confidence="High"
-        ))
-    
-    # Decision 3: Database in Private Subnet
-    private_rds = [rds for rds in model.rds_databases 
-                   if all(is_in_private_subnet(sid) for sid in rds.subnet_ids)]
-    if private_rds:
-        decisions.append(DecisionCard(
-            id="database-isolation",
-            title="Database in Isolated Private Subnet",
-            why="Prevents direct database access from the internet. Only application servers within the VPC can connect.",
-            risk_reduced="Eliminates risk of unauthorized database connections and data breaches",
-            risk_level="High",
-            tradeoff="Requires application servers in VPC to access database (cannot connect from local machine without VPN)",
-            cost_impact="$0 (no additional cost)",
-            confidence="High (security requirement)"
-        ))
-    
-    # Decision 4: Multi-AZ Database
-    multi_az_rds = [rds for rds in model.rds_databases if getattr(rds, 'multi_az', False)]
-    if multi_az_rds:
-        decisions.append(DecisionCard(
-            id="multi-az-database",
-            title="Multi-AZ Database Deployment",
-            why="Provides automatic failover to standby replica in different availability zone for high availability",
-            risk_reduced="Protects against availability zone failures and reduces downtime",
-            risk_level="Medium",
-            tradeoff="Doubles database infrastructure cost due to standby replica",
-            cost_impact="+100% database cost",
-            confidence="High"
-        ))
-    
-    # Decision 5: NAT Gateway
-    nat_gateways = getattr(model, 'nat_gateways', [])
-    if nat_gateways:
-        nat_count = len(nat_gateways)
-        decisions.append(DecisionCard(
-            id="nat-gateway",
-            title=f"NAT Gateway{'s' if nat_count > 1 else ''} for Outbound Access",
-            why="Allows private subnet resources to access internet for updates, patches, and external API calls while remaining private",
-            risk_reduced="Maintains security posture while enabling necessary outbound connectivity",
-            risk_level="Low",
-            tradeoff="Additional monthly cost and potential single point of failure for outbound traffic",
-            cost_impact=f"+${nat_count * 32}/month per NAT Gateway",
-            confidence="High"
-        ))
-    
-    # Decision 6: VPC Flow Logs
-    flow_logs = getattr(model, 'flow_logs', [])
-    if flow_logs:
-        decisions.append(DecisionCard(
-            id="flow-logs",
-            title="VPC Flow Logs Enabled",
-            why="Captures network traffic metadata for security analysis, troubleshooting, and compliance auditing",
-            risk_reduced="Enables detection of anomalous traffic patterns and security incidents",
-            risk_level="Low",
-            tradeoff="Additional storage costs for log data and requires log analysis tools",
-            cost_impact="+$5-10/month (varies by traffic volume)",
-            confidence="Medium"
-        ))
-    
-    # Decision 7: RDS Encryption
-    encrypted_rds = [rds for rds in model.rds_databases 
-                     if getattr(rds, 'storage_encrypted', False)]
-    if encrypted_rds:
-        decisions.append(DecisionCard(
-            id="database-encryption",
-            title="Database Encryption at Rest",
-            why="Protects sensitive data from unauthorized access to underlying storage volumes",
-            risk_reduced="Compliance with data protection regulations (GDPR, HIPAA, PCI-DSS)",
-            risk_level="High",
-            tradeoff="Minimal performance impact, cannot disable encryption after database creation",
-            cost_impact="$0 (included in RDS)",
-            confidence="High"
-        ))
-    
-    # Decision 8: VPC Created
-    if model.vpcs:
-        vpc = model.vpcs[0]
-        subnet_count = len(vpc.subnets)
-        decisions.append(DecisionCard(
-            id="vpc-isolation",
-            title="Dedicated VPC for Network Isolation",
-            why="Creates isolated network environment with full control over IP addressing, routing, and security",
-            risk_reduced="Prevents resource exposure to shared infrastructure",
-            risk_level="Medium",
-            tradeoff="Requires network configuration and subnet planning",
-            cost_impact="$0 (VPC is free)",
-            confidence="High"
-        ))
-    
-    # Decision 9: Multiple Subnets
-    if model.vpcs and len(model.vpcs[0].subnets) >= 2:
-        public_count = len([s for s in model.vpcs[0].subnets if s.subnet_type == SubnetType.PUBLIC])
-        private_count = len([s for s in model.vpcs[0].subnets if s.subnet_type == SubnetType.PRIVATE])
-        
-        if public_count > 0 and private_count > 0:
-            decisions.append(DecisionCard(
-                id="subnet-segmentation",
-                title="Public and Private Subnet Segmentation",
-                why="Separates internet-facing resources from internal resources for defense in depth",
-                risk_reduced="Limits blast radius of security incidents",
-                risk_level="High",
-                tradeoff="Increased network complexity and routing configuration",
-                cost_impact="$0 (subnets are free)",
-                confidence="High"
-            ))
-    
-    return decisions
+# Monthly EC2 on-demand estimates keyed directly by the InstanceType enum
+# member, so lookups skip the .value descriptor and hash by identity.
+# Amounts are integer cents - exact integer accumulation, no float drift.
+# Unknown types fall back to $20.00.
+_EC2_COST_MAP = {
+    InstanceType.T2_MICRO: 850,
+    InstanceType.T2_SMALL: 1700,
+    InstanceType.T2_MEDIUM: 3400,
+    InstanceType.T3_MICRO: 750,
+    InstanceType.T3_SMALL: 1500,
+}
 
 
-def estimate_monthly_cost(model: InfrastructureModel) -> Dict:
+def _analyze(model: InfrastructureModel) -> DecisionReport:
     """
-    Estimate rough monthly costs for infrastructure.
-    Prices based on US East (N. Virginia) region as of 2024.
+    Single fused traversal computing decisions, cost and complexity.
+    
+    Decision detection, cost estimation and complexity each used to walk the
+    same resource lists independently; this walks each list once and feeds
+    all three report sections from the same pass.
     """
-    cost = 0.0
-    breakdown = []
+    cost_cents = 0
+    # (label, cents) pairs; formatted into breakdown lines in one batch at
+    # the end so the hot loops only accumulate integers
+    items = []
     
-    # EC2 Instances
-    ec2_cost_map = {
-        "t2.micro": 8.50,
-        "t2.small": 17.00,
-        "t2.medium": 34.00,
-        "t3.micro": 7.50,
-        "t3.small": 15.00,
-        "t3.medium": 30.00,
-        "t3.large": 60.00,
-    }
+    # Subnet pass: private-subnet id table for O(1) placement checks, plus
+    # the first VPC's public/private counts for the segmentation rule -
+    # one walk instead of a set build and two counting comprehensions
+    private_ids = set()
+    public_subnet_count = 0
+    private_subnet_count = 0
+    for vpc_index, vpc in enumerate(model.vpcs):
+        for subnet in vpc.subnets:
+            if subnet.subnet_type is SubnetType.PRIVATE:
+                private_ids.add(subnet.id)
+                if vpc_index == 0:
+                    private_subnet_count += 1
+            elif vpc_index == 0:
+                public_subnet_count += 1
     
+    # EC2 pass: placement detection + cost accumulation
+    has_private_ec2 = False
     for ec2 in model.ec2_instances:
-        instance_cost = ec2_cost_map.get(ec2.instance_type.value, 20.00)
-        cost += instance_cost
-        breakdown.append(f"EC2 {ec2.instance_type.value}: ${instance_cost:.2f}")
+        # Stop testing membership once one private instance is known
+        if not has_private_ec2 and ec2.subnet_id in private_ids:
+            has_private_ec2 = True
+        instance_cents = _EC2_COST_MAP.get(ec2.instance_type, 2000)
+        cost_cents += instance_cents
+        items.append((f"EC2 {ec2.instance_type.value}", instance_cents))
     
-    # RDS Databases
+    # RDS pass: placement/flag detection + cost accumulation
+    has_private_rds = False
+    has_multi_az_rds = False
+    has_encrypted_rds = False
     for rds in model.rds_databases:
-        # Base cost estimate for db.t3.micro
-        db_cost = 50.00
+        # C-level superset test; only runs until the first fully-private database
+        if not has_private_rds and private_ids.issuperset(rds.subnet_ids):
+            has_private_rds = True
+        if rds.storage_encrypted:
+            has_encrypted_rds = True
         
-        # Double for Multi-AZ
-        if getattr(rds, 'multi_az', False):
-            db_cost *= 2
-        
-        cost += db_cost
-        multi_az_label = " (Multi-AZ)" if getattr(rds, 'multi_az', False) else ""
-        breakdown.append(f"RDS {rds.engine.value}{multi_az_label}: ${db_cost:.2f}")
+        # Base cost estimate for db.t3.micro, doubled for Multi-AZ
+        db_cents = 5000
+        multi_az_label = ""
+        if rds.multi_az:
+            has_multi_az_rds = True
+            db_cents *= 2
+            multi_az_label = " (Multi-AZ)"
+        cost_cents += db_cents
+        items.append((f"RDS {rds.engine.value}{multi_az_label}", db_cents))
     
     # Application Load Balancers
-    alb_cost = len(model.load_balancers) * 18.00
-    if model.load_balancers:
-        cost += alb_cost
-        breakdown.append(f"ALB ({len(model.load_balancers)}): ${alb_cost:.2f}")
+    lb_count = len(model.load_balancers)
+    if lb_count:
+        alb_cents = lb_count * 1800
+        cost_cents += alb_cents
+        items.append((f"ALB ({lb_count})", alb_cents))
     
     # NAT Gateways
-    nat_gateways = getattr(model, 'nat_gateways', [])
-    nat_cost = len(nat_gateways) * 32.00
-    if nat_gateways:
-        cost += nat_cost
-        breakdown.append(f"NAT Gateway ({len(nat_gateways)}): ${nat_cost:.2f}")
+    nat_count = len(model.nat_gateways)
+    if nat_count:
+        nat_cents = nat_count * 3200
+        cost_cents += nat_cents
+        items.append((f"NAT Gateway ({nat_count})", nat_cents))
     
     # VPC Flow Logs
-    flow_logs = getattr(model, 'flow_logs', [])
-    if flow_logs:
-        flow_cost = 7.00
-        cost += flow_cost
-        breakdown.append(f"VPC Flow Logs: ${flow_cost:.2f}")
+    if model.flow_logs:
+        cost_cents += 700
+        items.append(("VPC Flow Logs", 700))
     
     # S3 Buckets (minimal cost estimate)
-    if model.s3_buckets:
-        s3_cost = 5.00 * len(model.s3_buckets)
-        cost += s3_cost
-        breakdown.append(f"S3 Storage ({len(model.s3_buckets)} buckets): ${s3_cost:.2f}")
+    s3_count = len(model.s3_buckets)
+    if s3_count:
+        s3_cents = 500 * s3_count
+        cost_cents += s3_cents
+        items.append((f"S3 Storage ({s3_count} buckets)", s3_cents))
+    
+    breakdown = [f"{label}: ${cents / 100:.2f}" for label, cents in items]
+    
+    facts = _Facts(
+        has_private_ec2=has_private_ec2,
+        has_private_rds=has_private_rds,
+        has_multi_az_rds=has_multi_az_rds,
+        has_encrypted_rds=has_encrypted_rds,
+        lb_count=lb_count,
+        nat_count=nat_count,
+        public_subnet_count=public_subnet_count,
+        private_subnet_count=private_subnet_count,
+    )
+    decisions = _build_decisions(model, facts)
     
-    return {
-        "total": f"${cost:.2f}/month",
-        "breakdown": breakdown
-    }
-
-
-def determine_complexity(model: InfrastructureModel) -> str:
-    """Determine architecture complexity level."""
     resource_count = (
         len(model.vpcs) +
         len(model.ec2_instances) +
         len(model.rds_databases) +
-        len(model.load_balancers) +
-        len(model.s3_buckets) +
-        len(getattr(model, 'nat_gateways', []))
+        lb_count +
+        s3_count +
+        nat_count
     )
     
-    if resource_count <= 3:
-        return "Simple"
-    elif resource_count <= 8:
-        return "Moderate"
-    else:
-        return "Complex"
+    return DecisionReport(
+        decisions=decisions,
+        total_monthly_cost_estimate=f"${cost_cents / 100:.2f}/month",
+        architecture_complexity=_complexity_label(resource_count),
+        cost_breakdown=breakdown,
+    )
+
+
+# Cards with no dynamic content, built once at import and appended by
+# reference - frozen DecisionCard makes sharing them across reports safe
+_STATIC_CARDS: Dict[str, DecisionCard] = {card.id: card for card in (
+    DecisionCard(
+        id="private-subnet-ec2",
+        title="EC2 Instances in Private Subnet",
+        why="Reduces public attack surface by isolating compute resources from direct internet access. Only the load balancer is exposed publicly.",
+        risk_reduced="Prevents direct exploitation of application vulnerabilities and unauthorized access to compute instances",
+        risk_level=_HIGH,
+        tradeoff="Requires NAT Gateway for outbound internet access (updates, external APIs)",
+        cost_impact="+$32/month (NAT Gateway)",
+        confidence="High (industry best practice)"
+    ),
+    DecisionCard(
+        id="database-isolation",
+        title="Database in Isolated Private Subnet",
+        why="Prevents direct database access from the internet. Only application servers within the VPC can connect.",
+        risk_reduced="Eliminates risk of unauthorized database connections and data breaches",
+        risk_level=_HIGH,
+        tradeoff="Requires application servers in VPC to access database (cannot connect from local machine without VPN)",
+        cost_impact="$0 (no additional cost)",
+        confidence="High (security requirement)"
+    ),
+    DecisionCard(
+        id="multi-az-database",
+        title="Multi-AZ Database Deployment",
+        why="Provides automatic failover to standby replica in different availability zone for high availability",
+        risk_reduced="Protects against availability zone failures and reduces downtime",
+        risk_level=_MEDIUM,
+        tradeoff="Doubles database infrastructure cost due to standby replica",
+        cost_impact="+100% database cost",
+        confidence=_HIGH
+    ),
+    DecisionCard(
+        id="flow-logs",
+        title="VPC Flow Logs Enabled",
+        why="Captures network traffic metadata for security analysis, troubleshooting, and compliance auditing",
+        risk_reduced="Enables detection of anomalous traffic patterns and security incidents",
+        risk_level=_LOW,
+        tradeoff="Additional storage costs for log data and requires log analysis tools",
+        cost_impact="+$5-10/month (varies by traffic volume)",
+        confidence=_MEDIUM
+    ),
+    DecisionCard(
+        id="database-encryption",
+        title="Database Encryption at Rest",
+        why="Protects sensitive data from unauthorized access to underlying storage volumes",
+        risk_reduced="Compliance with data protection regulations (GDPR, HIPAA, PCI-DSS)",
+        risk_level=_HIGH,
+        tradeoff="Minimal performance impact, cannot disable encryption after database creation",
+        cost_impact="$0 (included in RDS)",
+        confidence=_HIGH
+    ),
+    DecisionCard(
+        id="vpc-isolation",
+        title="Dedicated VPC for Network Isolation",
+        why="Creates isolated network environment with full control over IP addressing, routing, and security",
+        risk_reduced="Prevents resource exposure to shared infrastructure",
+        risk_level=_MEDIUM,
+        tradeoff="Requires network configuration and subnet planning",
+        cost_impact="$0 (VPC is free)",
+        confidence=_HIGH
+    ),
+    DecisionCard(
+        id="subnet-segmentation",
+        title="Public and Private Subnet Segmentation",
+        why="Separates internet-facing resources from internal resources for defense in depth",
+        risk_reduced="Limits blast radius of security incidents",
+        risk_level=_HIGH,
+        tradeoff="Increased network complexity and routing configuration",
+        cost_impact="$0 (subnets are free)",
+        confidence=_HIGH
+    ),
+)}
+
+# Prototypes for cards whose content depends on resource counts; built once
+# at import with the common single-resource wording, and field-filled via
+# dataclasses.replace only when a count actually differs
+_LB_CARD_PROTO = DecisionCard(
+    id="load-balancer",
+    title="Application Load Balancer Added",
+    why="Enables horizontal scalability, fault tolerance, SSL termination, and distributes traffic across multiple instances",
+    risk_reduced="Improves availability and prevents single point of failure",
+    risk_level=_MEDIUM,
+    tradeoff="Increased complexity and additional component to manage",
+    cost_impact="+$18/month (ALB base cost)",
+    confidence=_HIGH
+)
+
+_NAT_CARD_PROTO = DecisionCard(
+    id="nat-gateway",
+    title="NAT Gateway for Outbound Access",
+    why="Allows private subnet resources to access internet for updates, patches, and external API calls while remaining private",
+    risk_reduced="Maintains security posture while enabling necessary outbound connectivity",
+    risk_level=_LOW,
+    tradeoff="Additional monthly cost and potential single point of failure for outbound traffic",
+    cost_impact="+$32/month per NAT Gateway",
+    confidence=_HIGH
+)
+
+
+@dataclass(slots=True)
+class _Facts:
+    """Aggregate facts gathered by _analyze, consumed by the decision rules."""
+    has_private_ec2: bool = False
+    has_private_rds: bool = False
+    has_multi_az_rds: bool = False
+    has_encrypted_rds: bool = False
+    lb_count: int = 0
+    nat_count: int = 0
+    # Public/private subnet counts of the first VPC, for Decision 9
+    public_subnet_count: int = 0
+    private_subnet_count: int = 0
+
+
+# The count-templated cards are memoized on just the count, so models that
+# differ everywhere else still share one card object per distinct count -
+# a finer-grained reuse than the whole-report cache
+
+@lru_cache(maxsize=64)
+def _lb_card_for(lb_count: int) -> DecisionCard:
+    """Load balancer card; count-templated when more than one ALB exists."""
+    if lb_count > 1:
+        return replace(_LB_CARD_PROTO,
+                       title="Application Load Balancers Added",
+                       cost_impact=f"+${lb_count * 18}/month (ALB base cost)")
+    return _LB_CARD_PROTO
+
+
+@lru_cache(maxsize=64)
+def _nat_card_for(nat_count: int) -> DecisionCard:
+    """NAT gateway card; count-templated when more than one gateway exists."""
+    if nat_count > 1:
+        return replace(_NAT_CARD_PROTO,
+                       title="NAT Gateways for Outbound Access",
+                       cost_impact=f"+${nat_count * 32}/month per NAT Gateway")
+    return _NAT_CARD_PROTO
+
+
+# The decision rules as one (predicate, card factory) table, in report order.
+# _build_decisions walks it in a single uniform loop; adding a rule is one
+# new row, not another hand-written if-block.
+_Predicate = Callable[[InfrastructureModel, _Facts], bool]
+_CardFactory = Callable[[InfrastructureModel, _Facts], DecisionCard]
+
+_RULES: Tuple[Tuple[_Predicate, _CardFactory], ...] = (
+    # Decision 1: EC2 in Private Subnet
+    (lambda model, f: f.has_private_ec2,
+     lambda model, f: _STATIC_CARDS["private-subnet-ec2"]),
+    # Decision 2: Load Balancer
+    (lambda model, f: f.lb_count > 0,
+     lambda model, f: _lb_card_for(f.lb_count)),
+    # Decision 3: Database in Private Subnet
+    (lambda model, f: f.has_private_rds,
+     lambda model, f: _STATIC_CARDS["database-isolation"]),
+    # Decision 4: Multi-AZ Database
+    (lambda model, f: f.has_multi_az_rds,
+     lambda model, f: _STATIC_CARDS["multi-az-database"]),
+    # Decision 5: NAT Gateway
+    (lambda model, f: f.nat_count > 0,
+     lambda model, f: _nat_card_for(f.nat_count)),
+    # Decision 6: VPC Flow Logs
+    (lambda model, f: bool(model.flow_logs),
+     lambda model, f: _STATIC_CARDS["flow-logs"]),
+    # Decision 7: RDS Encryption
+    (lambda model, f: f.has_encrypted_rds,
+     lambda model, f: _STATIC_CARDS["database-encryption"]),
+    # Decision 8: VPC Created
+    (lambda model, f: bool(model.vpcs),
+     lambda model, f: _STATIC_CARDS["vpc-isolation"]),
+    # Decision 9: Multiple Subnets - one of each type implies >= 2 subnets
+    (lambda model, f: f.public_subnet_count > 0 and f.private_subnet_count > 0,
+     lambda model, f: _STATIC_CARDS["subnet-segmentation"]),
+)
+
+
+def _build_decisions(model: InfrastructureModel, facts: _Facts) -> List[DecisionCard]:
+    """Assemble decision cards by walking the rule table."""
+    return [factory(model, facts)
+            for predicate, factory in _RULES if predicate(model, facts)]
+
+
+# Complexity buckets: <=3 Simple, <=8 Moderate, above Complex
+_COMPLEXITY_THRESHOLDS = (3, 8)
+_COMPLEXITY_LABELS = ("Simple", "Moderate", "Complex")
+
+
+def _complexity_label(resource_count: int) -> str:
+    """Map a total resource count to a complexity label."""
+    return _COMPLEXITY_LABELS[bisect_left(_COMPLEXITY_THRESHOLDS, resource_count)]
+
+
+def detect_decisions(model: InfrastructureModel) -> List[DecisionCard]:
+    """Detect architectural decisions from infrastructure model."""
+    return _analyze(model).decisions
+
+
+def estimate_monthly_cost(model: InfrastructureModel) -> Dict:
+    """
+    Estimate rough monthly costs for infrastructure.
+    Prices based on US East (N. Virginia) region as of 2024.
+    """
+    report = _analyze(model)
+    return {
+        "total": report.total_monthly_cost_estimate,
+        "breakdown": report.cost_breakdown
+    }
+
+
+def determine_complexity(model: InfrastructureModel) -> str:
+    """Determine architecture complexity level."""
+    return _analyze(model).architecture_complexity
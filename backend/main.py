@@ -6,9 +6,14 @@ Flow: Text → Parser → Model → [Diagram, Terraform, Security]
 The model is the single source of truth.
 """
 
+import asyncio
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, List, Any
 
@@ -17,8 +22,8 @@ from .diagram import generate_mermaid_diagram, generate_diagram_description
 from .terraform import generate_terraform_code
 from .security import validate_security, generate_security_report
 from .validator import validate_and_fix
-from .model import EditSource
-from .edits import add_resource, remove_resource, move_resource, update_resource_property
+from .model import EditSource, InfrastructureModel
+from .edits import add_resource, apply_operations, remove_resource, move_resource, update_resource_property
 from .terraform_parser import parse_terraform_edits
 from .idi import generate_decision_intelligence
 
@@ -27,12 +32,17 @@ from .idi import generate_decision_intelligence
 app = FastAPI(
     title="AI-Driven Infrastructure Generator",
     description="Generate infrastructure diagrams and IaC from natural language",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson serializer (C) instead of json.dumps
 )
 
 # Get frontend URL from environment or use wildcard
 FRONTEND_URL = os.getenv("FRONTEND_URL", "")
 
+# Bounded executor for CPU-bound generation work (parse/diagram/terraform/IDI)
+# so heavy renders don't compete with FastAPI's shared request threadpool
+_CPU_EXECUTOR = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2))
+
 # Enable CORS for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -98,7 +108,7 @@ class TerraformEditRequest(BaseModel):
 @app.get("/")
 def read_root():
     """Health check endpoint"""
-    return {
+    return ORJSONResponse({
         "status": "healthy",
         "service": "AI-Driven Infrastructure Generator",
         "version": "1.0.0",
@@ -108,13 +118,13 @@ def read_root():
             "POST /edit/terraform": "Edit infrastructure via Terraform code",
             "GET /health": "Health check"
         }
-    }
+    })
 
 
 @app.get("/health")
 def health_check():
     """Detailed health check"""
-    return {
+    return ORJSONResponse({
         "status": "healthy",
         "components": {
             "parser": "operational",
@@ -124,26 +134,36 @@ def health_check():
             "edit_operations": "operational",
             "terraform_parser": "operational"
         }
-    }
+    })
 
 
-@app.post("/text", response_model=InfrastructureResponse)
-def generate_infrastructure(request: TextRequest):
+@app.post("/text", responses={200: {"model": InfrastructureResponse}})
+async def generate_infrastructure(request: TextRequest):
     """
     Main endpoint: Generate infrastructure from text description.
-    
+
     Pipeline:
     1. Text → Parser → Infrastructure Model
     2. Model → Diagram Generator → Mermaid
     3. Model → Terraform Generator → IaC Code
     4. Model → Security Validator → Warnings
-    
+
     The model is the single source of truth - all outputs derive from it.
     """
+    # The pipeline is CPU-bound Python; run it on the bounded executor so the
+    # event loop stays free for other requests
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _CPU_EXECUTOR, _generate_infrastructure_sync, request.text
+    )
+
+
+def _generate_infrastructure_sync(text: str) -> ORJSONResponse:
+    """Synchronous generation pipeline, executed on the CPU executor."""
     try:
         # Step 1: Parse text into infrastructure model
         # This is where AI/LLM is used (mock for now)
-        model = parse_text_to_model(request.text)
+        model = parse_text_to_model(text)
         
         # Step 2: VALIDATE AND AUTO-FIX (Architecture Compiler)
         model, validation_result = validate_and_fix(model)
@@ -175,21 +195,21 @@ def generate_infrastructure(request: TextRequest):
             }
         
         # Store model for edit operations
-        MODEL_STORE[model.model_id] = model
+        _store_model(model)
         
         # Step 7: Return combined response with corrections and IDI
-        return InfrastructureResponse(
-            success=True,
-            description=diagram_desc,
-            mermaid_diagram=mermaid_diagram,
-            terraform_code=terraform_code,
-            security_warnings=[w.to_dict() for w in security_warnings],
-            security_report=security_report,
-            model_summary=model.to_dict(),
-            model_id=model.model_id,
-            corrections=validation_result.corrections,  # Architecture auto-corrections
-            decision_intelligence=decision_intelligence  # Infrastructure Decision Intelligence
-        )
+        return ORJSONResponse({
+            "success": True,
+            "description": diagram_desc,
+            "mermaid_diagram": mermaid_diagram,
+            "terraform_code": terraform_code,
+            "security_warnings": [w.to_dict() for w in security_warnings],
+            "security_report": security_report,
+            "model_summary": model.to_dict(),
+            "model_id": model.model_id,
+            "corrections": validation_result.corrections,  # Architecture auto-corrections
+            "decision_intelligence": decision_intelligence  # Infrastructure Decision Intelligence
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -199,26 +219,34 @@ def generate_infrastructure(request: TextRequest):
 
 
 @app.post("/validate")
-def validate_infrastructure(request: TextRequest):
+async def validate_infrastructure(request: TextRequest):
     """
     Validation-only endpoint: Parse text and return security warnings.
     Useful for checking infrastructure before generation.
     """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _CPU_EXECUTOR, _validate_infrastructure_sync, request.text
+    )
+
+
+def _validate_infrastructure_sync(text: str) -> ORJSONResponse:
+    """Synchronous validation pipeline, executed on the CPU executor."""
     try:
         # Parse text into model
-        model = parse_text_to_model(request.text)
+        model = parse_text_to_model(text)
         
         # Validate security
         security_warnings = validate_security(model)
         security_report = generate_security_report(security_warnings)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "warnings_count": len(security_warnings),
             "security_warnings": [w.to_dict() for w in security_warnings],
             "security_report": security_report,
             "model_summary": model.to_dict()
-        }
+        })
     
     except Exception as e:
         raise HTTPException(
@@ -227,12 +255,59 @@ def validate_infrastructure(request: TextRequest):
         )
 
 
-# Global model store (in production, use a database)
-MODEL_STORE = {}
+# Global model store (in production, use a database). Bounded LRU so a
+# long-running process cannot accumulate abandoned models without limit;
+# recently generated or edited models stay resident.
+MODEL_STORE: "OrderedDict[str, InfrastructureModel]" = OrderedDict()
+MODEL_STORE_MAX = 256
+_STORE_LOCK = threading.Lock()  # Endpoints share a thread pool; LRU ops aren't atomic
+
+
+def _store_model(model: InfrastructureModel) -> None:
+    """Insert or refresh a model in the store, evicting the LRU entry if full."""
+    with _STORE_LOCK:
+        MODEL_STORE[model.model_id] = model
+        MODEL_STORE.move_to_end(model.model_id)
+        if len(MODEL_STORE) > MODEL_STORE_MAX:
+            MODEL_STORE.popitem(last=False)
+
+
+def _get_model(model_id: str) -> "InfrastructureModel | None":
+    """Fetch a model from the store, marking it most recently used."""
+    with _STORE_LOCK:
+        model = MODEL_STORE.get(model_id)
+        if model is not None:
+            MODEL_STORE.move_to_end(model_id)
+    return model
+
+
+def _discard_model(model_id: str) -> None:
+    """Drop a store entry whose model was renamed by edit tracking.
+
+    Edits mutate the stored model in place and update_edit_tracking gives
+    it a new model_id; without this the old key keeps aliasing the mutated
+    object, so stale ids would silently edit the latest state instead of
+    returning 404.
+    """
+    with _STORE_LOCK:
+        MODEL_STORE.pop(model_id, None)
+
+
+# Striped per-model edit locks. Edits mutate the stored model in place, so
+# two thread-pool workers editing the same model_id concurrently would
+# interleave list/index mutations and corrupt it. A fixed stripe of locks
+# keyed by id hash serializes the fetch -> mutate -> store sequence without
+# growing per-model state; unrelated models rarely share a stripe.
+_EDIT_LOCK_STRIPES = tuple(threading.Lock() for _ in range(64))
+
+
+def _edit_lock(model_id: str) -> threading.Lock:
+    """Lock guarding edits for a given model id"""
+    return _EDIT_LOCK_STRIPES[hash(model_id) % len(_EDIT_LOCK_STRIPES)]
 
 
 @app.post("/edit/diagram")
-def edit_via_diagram(request: DiagramEditRequest):
+async def edit_via_diagram(request: DiagramEditRequest):
     """
     Edit infrastructure via diagram events
     
@@ -240,53 +315,64 @@ def edit_via_diagram(request: DiagramEditRequest):
     
     Loop Prevention: Tracks EditSource.DIAGRAM
     """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _CPU_EXECUTOR, _edit_via_diagram_sync, request
+    )
+
+
+def _edit_via_diagram_sync(request: DiagramEditRequest) -> ORJSONResponse:
+    """Synchronous diagram-edit pipeline, executed on the CPU executor."""
     try:
-        # Get current model from store
-        current_model = MODEL_STORE.get(request.current_model_id)
-        if not current_model:
-            raise HTTPException(404, f"Model {request.current_model_id} not found")
+        with _edit_lock(request.current_model_id):
+            # Get current model from store
+            current_model = _get_model(request.current_model_id)
+            if not current_model:
+                raise HTTPException(404, f"Model {request.current_model_id} not found")
         
-        # Execute edit operation
-        result = None
-        if request.operation == "add_resource":
-            result = add_resource(current_model, request.resource_type, request.properties, EditSource.DIAGRAM)
-        elif request.operation == "remove_resource":
-            result = remove_resource(current_model, request.resource_id, EditSource.DIAGRAM)
-        elif request.operation == "move_resource":
-            result = move_resource(current_model, request.resource_id, request.target_subnet_id, EditSource.DIAGRAM)
-        elif request.operation == "update_resource_property":
-            result = update_resource_property(current_model, request.resource_id, request.property_name, request.value, EditSource.DIAGRAM)
-        else:
-            raise HTTPException(400, f"Unknown operation: {request.operation}")
+            # Execute edit operation
+            result = None
+            if request.operation == "add_resource":
+                result = add_resource(current_model, request.resource_type, request.properties, EditSource.DIAGRAM)
+            elif request.operation == "remove_resource":
+                result = remove_resource(current_model, request.resource_id, EditSource.DIAGRAM)
+            elif request.operation == "move_resource":
+                result = move_resource(current_model, request.resource_id, request.target_subnet_id, EditSource.DIAGRAM)
+            elif request.operation == "update_resource_property":
+                result = update_resource_property(current_model, request.resource_id, request.property_name, request.value, EditSource.DIAGRAM)
+            else:
+                raise HTTPException(400, f"Unknown operation: {request.operation}")
         
-        if not result.success:
-            return {"success": False, "error": result.error, "warnings": [w.to_dict() for w in result.warnings] if result.warnings else []}
+            if not result.success:
+                return ORJSONResponse({"success": False, "error": result.error, "warnings": [w.to_dict() for w in result.warnings] if result.warnings else []})
         
-        # Store updated model
-        updated_model = result.model
-        MODEL_STORE[updated_model.model_id] = updated_model
+            # Store updated model; retire the pre-edit id so it can't alias
+            updated_model = result.model
+            if updated_model.model_id != request.current_model_id:
+                _discard_model(request.current_model_id)
+            _store_model(updated_model)
         
-        # Regenerate both diagram and Terraform for frontend display
-        mermaid_diagram = generate_mermaid_diagram(updated_model)
-        terraform_code = generate_terraform_code(updated_model)
-        security_report = generate_security_report(result.warnings)
+            # Regenerate both diagram and Terraform for frontend display
+            mermaid_diagram = generate_mermaid_diagram(updated_model)
+            terraform_code = generate_terraform_code(updated_model)
+            security_report = generate_security_report(result.warnings)
         
-        return {
-            "success": True,
-            "model_id": updated_model.model_id,
-            "model_summary": updated_model.to_dict(),  # CRITICAL: Frontend needs this for React Flow
-            "mermaid_diagram": mermaid_diagram,
-            "terraform_code": terraform_code,
-            "security_warnings": [w.to_dict() for w in result.warnings],
-            "security_report": security_report,
-            "message": f"Applied {request.operation} successfully"
-        }
+            return ORJSONResponse({
+                "success": True,
+                "model_id": updated_model.model_id,
+                "model_summary": updated_model.to_dict(),  # CRITICAL: Frontend needs this for React Flow
+                "mermaid_diagram": mermaid_diagram,
+                "terraform_code": terraform_code,
+                "security_warnings": [w.to_dict() for w in result.warnings],
+                "security_report": security_report,
+                "message": f"Applied {request.operation} successfully"
+            })
     except Exception as e:
         raise HTTPException(500, f"Edit failed: {str(e)}")
 
 
 @app.post("/edit/terraform")
-def edit_via_terraform(request: TerraformEditRequest):
+async def edit_via_terraform(request: TerraformEditRequest):
     """
     Edit infrastructure via Terraform code modifications
     
@@ -294,57 +380,61 @@ def edit_via_terraform(request: TerraformEditRequest):
     
     Loop Prevention: Tracks EditSource.TERRAFORM
     """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _CPU_EXECUTOR, _edit_via_terraform_sync, request
+    )
+
+
+def _edit_via_terraform_sync(request: TerraformEditRequest) -> ORJSONResponse:
+    """Synchronous Terraform-edit pipeline, executed on the CPU executor."""
     try:
-        current_model = MODEL_STORE.get(request.current_model_id)
-        if not current_model:
-            raise HTTPException(404, f"Model {request.current_model_id} not found")
+        with _edit_lock(request.current_model_id):
+            current_model = _get_model(request.current_model_id)
+            if not current_model:
+                raise HTTPException(404, f"Model {request.current_model_id} not found")
         
-        # Parse Terraform changes
-        edit_operations = parse_terraform_edits(request.original_terraform, request.modified_terraform)
+            # UI "save" clicks are frequently no-ops; an identical-string check
+            # is a C-level memcmp, far cheaper than diffing the HCL
+            if request.original_terraform == request.modified_terraform:
+                return ORJSONResponse({"success": True, "message": "No changes detected", "model_id": current_model.model_id})
         
-        if not edit_operations:
-            return {"success": True, "message": "No changes detected", "model_id": current_model.model_id}
+            # Parse Terraform changes
+            edit_operations = parse_terraform_edits(request.original_terraform, request.modified_terraform)
         
-        # Apply operations
-        working_model = current_model
-        all_warnings = []
+            if not edit_operations:
+                return ORJSONResponse({"success": True, "message": "No changes detected", "model_id": current_model.model_id})
         
-        for op in edit_operations:
-            if op['operation'] == 'update_resource_property':
-                result = update_resource_property(working_model, op['resource_id'], op['property'], op['value'], EditSource.TERRAFORM)
-            elif op['operation'] == 'move_resource':
-                result = move_resource(working_model, op['resource_id'], op['target_subnet_id'], EditSource.TERRAFORM)
-            elif op['operation'] == 'remove_resource':
-                result = remove_resource(working_model, op['resource_id'], EditSource.TERRAFORM)
-            else:
-                continue
-            
+            # Apply the whole batch through the edit layer
+            result = apply_operations(current_model, edit_operations, EditSource.TERRAFORM)
             if not result.success:
-                return {"success": False, "error": f"Failed: {result.error}", "warnings": [w.to_dict() for w in result.warnings] if result.warnings else []}
-            
+                return ORJSONResponse({"success": False, "error": f"Failed: {result.error}", "warnings": [w.to_dict() for w in result.warnings] if result.warnings else []})
+        
             working_model = result.model
-            all_warnings.extend(result.warnings)
+            all_warnings = result.warnings
         
-        # Store updated model
-        MODEL_STORE[working_model.model_id] = working_model
+            # Store updated model; retire the pre-edit id so it can't alias
+            if working_model.model_id != request.current_model_id:
+                _discard_model(request.current_model_id)
+            _store_model(working_model)
         
-        # Regenerate both diagram AND Terraform (so code doesn't disappear)
-        mermaid_diagram = generate_mermaid_diagram(working_model)
-        terraform_code = generate_terraform_code(working_model)  # CRITICAL FIX: Regenerate Terraform
-        diagram_desc = generate_diagram_description(working_model)
-        security_report = generate_security_report(all_warnings)
+            # Regenerate both diagram AND Terraform (so code doesn't disappear)
+            mermaid_diagram = generate_mermaid_diagram(working_model)
+            terraform_code = generate_terraform_code(working_model)  # CRITICAL FIX: Regenerate Terraform
+            diagram_desc = generate_diagram_description(working_model)
+            security_report = generate_security_report(all_warnings)
         
-        return {
-            "success": True,
-            "model_id": working_model.model_id,
-            "mermaid_diagram": mermaid_diagram,
-            "terraform_code": terraform_code,  # CRITICAL FIX: Include in response
-            "description": diagram_desc,
-            "security_warnings": [w.to_dict() for w in all_warnings],
-            "security_report": security_report,
-            "operations_applied": len(edit_operations),
-            "message": f"Applied {len(edit_operations)} operation(s)"
-        }
+            return ORJSONResponse({
+                "success": True,
+                "model_id": working_model.model_id,
+                "mermaid_diagram": mermaid_diagram,
+                "terraform_code": terraform_code,  # CRITICAL FIX: Include in response
+                "description": diagram_desc,
+                "security_warnings": [w.to_dict() for w in all_warnings],
+                "security_report": security_report,
+                "operations_applied": len(edit_operations),
+                "message": f"Applied {len(edit_operations)} operation(s)"
+            })
     except Exception as e:
         raise HTTPException(500, f"Terraform edit failed: {str(e)}")
 
@@ -352,4 +442,14 @@ def edit_via_terraform(request: TerraformEditRequest):
 # Run with: uvicorn backend.main:app --reload
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvicorn[standard] bundles uvloop and httptools; select them explicitly
+    # so the libuv event loop and C HTTP parser replace the pure-Python
+    # asyncio/h11 defaults
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
@@ -7,7 +7,10 @@ Edit Tracking: Models track their edit source to prevent infinite loops
 when synchronizing between diagram and Terraform views.
 """
 
-from typing import List, Optional, Dict
+import copy
+import hashlib
+import json
+from typing import List, Optional, Dict, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -43,7 +46,7 @@ class DatabaseEngine(Enum):
     MARIADB = "mariadb"
 
 
-@dataclass
+@dataclass(slots=True)
 class Subnet:
     """Represents a subnet within a VPC"""
     id: str
@@ -62,7 +65,7 @@ class Subnet:
             self.subnet_type = SubnetType(self.subnet_type)
 
 
-@dataclass
+@dataclass(slots=True)
 class EC2Instance:
     """Represents an EC2 instance"""
     id: str
@@ -84,7 +87,7 @@ class EC2Instance:
             self.instance_type = InstanceType(self.instance_type)
 
 
-@dataclass
+@dataclass(slots=True)
 class RDSDatabase:
     """Represents an RDS database instance"""
     id: str
@@ -93,6 +96,8 @@ class RDSDatabase:
     instance_class: str
     subnet_ids: List[str]
     allocated_storage: int = 20
+    multi_az: bool = False
+    storage_encrypted: bool = False
     
     def __post_init__(self):
         """Ensure engine is an Enum"""
@@ -107,7 +112,7 @@ class RDSDatabase:
             self.engine = DatabaseEngine(self.engine)
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadBalancer:
     """Represents an Application Load Balancer"""
     id: str
@@ -116,7 +121,7 @@ class LoadBalancer:
     target_instance_ids: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class S3Bucket:
     """Represents an S3 storage bucket"""
     id: str
@@ -125,7 +130,7 @@ class S3Bucket:
     encryption_enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityGroup:
     """Represents a security group (firewall rules)"""
     id: str
@@ -136,7 +141,7 @@ class SecurityGroup:
     egress_rules: List[Dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class NATGateway:
     """Represents a NAT Gateway for private subnet internet access"""
     id: str
@@ -150,7 +155,7 @@ class NATGateway:
             raise ValueError("NAT Gateway must be in a subnet")
 
 
-@dataclass
+@dataclass(slots=True)
 class VPCFlowLogs:
     """Represents VPC Flow Logs for network monitoring"""
     id: str
@@ -160,7 +165,7 @@ class VPCFlowLogs:
     log_group_name: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class VPC:
     """Represents a Virtual Private Cloud"""
     id: str
@@ -172,8 +177,24 @@ class VPC:
         """Add a subnet to this VPC"""
         self.subnets.append(subnet)
 
+    def partition_subnets(self) -> Tuple[List[Subnet], List[Subnet]]:
+        """
+        Split subnets into (public, private) lists in a single pass.
 
-@dataclass
+        Callers that need both partitions (validator, security checks) should
+        use this instead of filtering vpc.subnets once per subnet type.
+        """
+        public: List[Subnet] = []
+        private: List[Subnet] = []
+        for subnet in self.subnets:
+            if subnet.subnet_type == SubnetType.PUBLIC:
+                public.append(subnet)
+            else:
+                private.append(subnet)
+        return public, private
+
+
+@dataclass(slots=True)
 class InfrastructureModel:
     """
     The central infrastructure model - single source of truth.
@@ -198,6 +219,27 @@ class InfrastructureModel:
     last_edit_timestamp: Optional[datetime] = None
     model_id: str = "model-v1"  # Incremented on edits for conflict detection
     
+    # Internal id -> (kind, resource) index so edits resolve resources in
+    # O(1) instead of scanning five lists. Kept in sync by the add_* methods
+    # and the edit layer; excluded from serialization and comparisons.
+    _resource_index: Dict[str, Tuple[str, object]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    
+    # Per-prefix counters backing next_resource_id; monotonic across the
+    # model lifetime so removed ids are never reissued
+    _id_counters: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Seed the id index from resources passed to the constructor"""
+        for kind, resources in (("ec2", self.ec2_instances),
+                                ("rds", self.rds_databases),
+                                ("load_balancer", self.load_balancers),
+                                ("s3", self.s3_buckets),
+                                ("security_group", self.security_groups)):
+            for resource in resources:
+                self._resource_index[resource.id] = (kind, resource)
+    
     def add_vpc(self, vpc: VPC):
         """Add a VPC to the model"""
         self.vpcs.append(vpc)
@@ -205,22 +247,27 @@ class InfrastructureModel:
     def add_ec2(self, instance: EC2Instance):
         """Add an EC2 instance to the model"""
         self.ec2_instances.append(instance)
+        self._resource_index[instance.id] = ("ec2", instance)
     
     def add_rds(self, database: RDSDatabase):
         """Add an RDS database to the model"""
         self.rds_databases.append(database)
+        self._resource_index[database.id] = ("rds", database)
     
     def add_load_balancer(self, lb: LoadBalancer):
         """Add a load balancer to the model"""
         self.load_balancers.append(lb)
+        self._resource_index[lb.id] = ("load_balancer", lb)
     
     def add_s3_bucket(self, bucket: S3Bucket):
         """Add an S3 bucket to the model"""
         self.s3_buckets.append(bucket)
+        self._resource_index[bucket.id] = ("s3", bucket)
     
     def add_security_group(self, sg: SecurityGroup):
         """Add a security group to the model"""
         self.security_groups.append(sg)
+        self._resource_index[sg.id] = ("security_group", sg)
     
     def add_nat_gateway(self, nat: NATGateway):
         """Add a NAT Gateway to the model"""
@@ -230,6 +277,27 @@ class InfrastructureModel:
         """Add VPC Flow Logs to the model"""
         self.flow_logs.append(logs)
     
+    def next_resource_id(self, prefix: str) -> str:
+        """
+        Next default id for a resource kind, e.g. "ec2" -> "ec2-3".
+
+        len(list)+1 ids collide once a resource is removed and another is
+        added; this counter only moves forward and skips ids that already
+        exist (e.g. parser-assigned ones).
+        """
+        n = self._id_counters.get(prefix, 0)
+        while True:
+            n += 1
+            new_id = f"{prefix}-{n}"
+            if new_id not in self._resource_index:
+                break
+        self._id_counters[prefix] = n
+        return new_id
+    
+    def get_resource_by_id(self, resource_id: str) -> Optional[Tuple[str, object]]:
+        """O(1) lookup of (kind, resource) for EC2/RDS/LB/S3/SG ids"""
+        return self._resource_index.get(resource_id)
+    
     def get_subnet_by_id(self, subnet_id: str) -> Optional[Subnet]:
         """Find a subnet by ID across all VPCs"""
         for vpc in self.vpcs:
@@ -254,6 +322,93 @@ class InfrastructureModel:
         version = int(self.model_id.split('-v')[-1]) + 1
         self.model_id = f"model-v{version}"
     
+    def __deepcopy__(self, memo):
+        """
+        Hand-rolled deep copy for fast model snapshots.
+
+        The generic copy.deepcopy walks every reachable object and does memo
+        bookkeeping per node. Model leaves are immutable (strings, enums,
+        datetimes) or flat lists of them, so rebuilding the tree directly is
+        several times faster and safely shares the immutable leaves. Only the
+        security-group rule dicts are arbitrarily nested and keep the generic
+        path.
+        """
+        new = InfrastructureModel(
+            vpcs=[
+                VPC(id=v.id, name=v.name, cidr=v.cidr,
+                    subnets=[
+                        Subnet(id=s.id, name=s.name, cidr=s.cidr,
+                               subnet_type=s.subnet_type,
+                               availability_zone=s.availability_zone)
+                        for s in v.subnets
+                    ])
+                for v in self.vpcs
+            ],
+            ec2_instances=[
+                EC2Instance(id=e.id, name=e.name,
+                            instance_type=e.instance_type,
+                            subnet_id=e.subnet_id, ami=e.ami)
+                for e in self.ec2_instances
+            ],
+            rds_databases=[
+                RDSDatabase(id=r.id, name=r.name, engine=r.engine,
+                            instance_class=r.instance_class,
+                            subnet_ids=list(r.subnet_ids),
+                            allocated_storage=r.allocated_storage,
+                            multi_az=r.multi_az,
+                            storage_encrypted=r.storage_encrypted)
+                for r in self.rds_databases
+            ],
+            load_balancers=[
+                LoadBalancer(id=lb.id, name=lb.name,
+                             subnet_ids=list(lb.subnet_ids),
+                             target_instance_ids=list(lb.target_instance_ids))
+                for lb in self.load_balancers
+            ],
+            s3_buckets=[
+                S3Bucket(id=b.id, name=b.name,
+                         versioning_enabled=b.versioning_enabled,
+                         encryption_enabled=b.encryption_enabled)
+                for b in self.s3_buckets
+            ],
+            security_groups=[
+                SecurityGroup(id=sg.id, name=sg.name, vpc_id=sg.vpc_id,
+                              description=sg.description,
+                              ingress_rules=copy.deepcopy(sg.ingress_rules, memo),
+                              egress_rules=copy.deepcopy(sg.egress_rules, memo))
+                for sg in self.security_groups
+            ],
+            nat_gateways=[
+                NATGateway(id=n.id, name=n.name, subnet_id=n.subnet_id,
+                           elastic_ip=n.elastic_ip)
+                for n in self.nat_gateways
+            ],
+            flow_logs=[
+                VPCFlowLogs(id=fl.id, vpc_id=fl.vpc_id,
+                            log_destination_type=fl.log_destination_type,
+                            traffic_type=fl.traffic_type,
+                            log_group_name=fl.log_group_name)
+                for fl in self.flow_logs
+            ],
+            last_edit_source=self.last_edit_source,
+            last_edit_timestamp=self.last_edit_timestamp,
+            model_id=self.model_id,
+        )
+        memo[id(self)] = new
+        return new
+
+    def content_hash(self) -> str:
+        """
+        Stable fingerprint of the model contents.
+
+        Derived from to_dict() so it covers every resource but ignores the
+        edit-tracking fields (model_id, timestamps). Used to key caches of
+        deterministic generators (diagram, Terraform) - identical content
+        always produces identical output.
+        """
+        payload = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
     def to_dict(self) -> Dict:
         """Convert model to dictionary for API responses and frontend consumption"""
         return {
@@ -289,7 +444,9 @@ class InfrastructureModel:
                     "engine": {"value": rds.engine.value},  # React Flow needs this format
                     "instance_class": rds.instance_class,
                     "subnet_ids": rds.subnet_ids,
-                    "allocated_storage": rds.allocated_storage
+                    "allocated_storage": rds.allocated_storage,
+                    "multi_az": rds.multi_az,
+                    "storage_encrypted": rds.storage_encrypted
                 } for rds in self.rds_databases
             ],
             "load_balancers": [
@@ -4,7 +4,7 @@ Validates the infrastructure model against best practices and security standards
 This operates at the model level, not on Terraform or diagrams.
 """
 
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 from .model import InfrastructureModel, SubnetType
 
 
@@ -25,7 +25,41 @@ class SecurityWarning:
         }
 
 
-def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
+class SecurityReport:
+    """
+    Security warnings bucketed by severity at collection time.
+
+    The edit layer only ever gates on HIGH warnings, so keeping the buckets
+    separate makes that check a list read instead of a filter pass. The
+    report iterates HIGH -> MEDIUM -> LOW, so callers that treat it as a
+    flat warning sequence keep working.
+    """
+    def __init__(self):
+        self.high: List[SecurityWarning] = []
+        self.medium: List[SecurityWarning] = []
+        self.low: List[SecurityWarning] = []
+        self._buckets = {"HIGH": self.high, "MEDIUM": self.medium, "LOW": self.low}
+
+    def append(self, warning: SecurityWarning):
+        """File the warning under its severity bucket"""
+        self._buckets[warning.severity].append(warning)
+
+    @property
+    def warnings(self) -> List[SecurityWarning]:
+        """All warnings as one list, most severe first"""
+        return self.high + self.medium + self.low
+
+    def __iter__(self):
+        yield from self.high
+        yield from self.medium
+        yield from self.low
+
+    def __len__(self) -> int:
+        return len(self.high) + len(self.medium) + len(self.low)
+
+
+def validate_security(model: InfrastructureModel,
+                      scope: Optional[Iterable[str]] = None) -> SecurityReport:
     """
     Validate the infrastructure model for security best practices.
     
@@ -37,10 +71,65 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
     - Load balancers should be in public subnets
     - VPC should have both public and private subnets for proper segmentation
     - Security group configurations (implied from model)
+    
+    `scope` optionally names the resource kinds an edit just touched
+    ("ec2", "rds", "load_balancer", "subnet", "vpc", "s3",
+    "security_group"). When given, only checks that read those kinds are
+    re-evaluated - an incremental validation for the edit path, where the
+    rest of the model was already validated before the edit. With the
+    default None every check runs.
     """
-    warnings = []
+    if scope is not None and not isinstance(scope, frozenset):
+        scope = frozenset(scope)
+    warnings = SecurityReport()
     
     # Check 1: RDS databases should be in private subnets only
+    if _in_scope(scope, _RDS_SUBNET_KINDS):
+        _check_rds_placement(model, warnings)
+    
+    # Check 2: Ensure RDS has multi-AZ deployment (at least 2 subnets)
+    if _in_scope(scope, _RDS_KINDS):
+        _check_rds_multi_az(model, warnings)
+    
+    # Check 3: VPC should have network segmentation (both public and private subnets)
+    if _in_scope(scope, _VPC_SEGMENTATION_KINDS):
+        _check_vpc_segmentation(model, warnings)
+    
+    # Check 4: Load balancers should be in public subnets
+    if _in_scope(scope, _LB_SUBNET_KINDS):
+        _check_lb_placement(model, warnings)
+    
+    # Check 5 + 7: EC2 exposure relative to load balancers
+    if _in_scope(scope, _EC2_LB_KINDS):
+        _check_ec2_exposure(model, warnings)
+    
+    # Check 6: Warn about default credentials in RDS (from terraform.py)
+    if _in_scope(scope, _RDS_KINDS):
+        _check_rds_credentials(model, warnings)
+    
+    # Check 8: VPC CIDR should not overlap with common private ranges
+    if _in_scope(scope, _VPC_KINDS):
+        _check_vpc_cidr(model, warnings)
+    
+    return warnings
+
+
+# Resource kinds each check reads; used to skip checks an edit cannot affect
+_RDS_KINDS = frozenset({"rds"})
+_VPC_KINDS = frozenset({"vpc"})
+_RDS_SUBNET_KINDS = frozenset({"rds", "subnet"})
+_LB_SUBNET_KINDS = frozenset({"load_balancer", "subnet"})
+_EC2_LB_KINDS = frozenset({"ec2", "load_balancer", "subnet"})
+_VPC_SEGMENTATION_KINDS = frozenset({"vpc", "subnet", "load_balancer"})
+
+
+def _in_scope(scope: Optional[frozenset], kinds: frozenset) -> bool:
+    """True when the check reading `kinds` must run for this `scope`"""
+    return scope is None or not scope.isdisjoint(kinds)
+
+
+def _check_rds_placement(model: InfrastructureModel, warnings: SecurityReport):
+    """RDS databases should be in private subnets only"""
     for rds in model.rds_databases:
         for subnet_id in rds.subnet_ids:
             subnet = model.get_subnet_by_id(subnet_id)
@@ -52,8 +141,10 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
                     recommendation="Move RDS instances to private subnets to prevent direct internet access"
                 ))
                 break
-    
-    # Check 2: Ensure RDS has multi-AZ deployment (at least 2 subnets)
+
+
+def _check_rds_multi_az(model: InfrastructureModel, warnings: SecurityReport):
+    """RDS should span at least 2 subnets for multi-AZ"""
     for rds in model.rds_databases:
         if len(rds.subnet_ids) < 2:
             warnings.append(SecurityWarning(
@@ -62,12 +153,15 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
                 message="Database is not configured for multi-AZ deployment",
                 recommendation="Use at least 2 subnets in different availability zones for high availability"
             ))
-    
-    # Check 3: VPC should have network segmentation (both public and private subnets)
+
+
+def _check_vpc_segmentation(model: InfrastructureModel, warnings: SecurityReport):
+    """VPC should have both public and private subnets"""
     for vpc in model.vpcs:
-        has_public = any(s.subnet_type == SubnetType.PUBLIC for s in vpc.subnets)
-        has_private = any(s.subnet_type == SubnetType.PRIVATE for s in vpc.subnets)
-        
+        public_subnets, private_subnets = vpc.partition_subnets()
+        has_public = bool(public_subnets)
+        has_private = bool(private_subnets)
+
         if not has_private:
             warnings.append(SecurityWarning(
                 severity="MEDIUM",
@@ -83,8 +177,10 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
                 message="VPC has no public subnets but load balancers are defined",
                 recommendation="Create public subnets for internet-facing resources like load balancers"
             ))
-    
-    # Check 4: Load balancers should be in public subnets
+
+
+def _check_lb_placement(model: InfrastructureModel, warnings: SecurityReport):
+    """Load balancers should be in public subnets"""
     for lb in model.load_balancers:
         for subnet_id in lb.subnet_ids:
             subnet = model.get_subnet_by_id(subnet_id)
@@ -96,8 +192,11 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
                     recommendation="Place internet-facing load balancers in public subnets"
                 ))
                 break
-    
-    # Check 5: EC2 instances serving web traffic should be behind load balancers
+
+
+def _check_ec2_exposure(model: InfrastructureModel, warnings: SecurityReport):
+    """EC2 instances should sit behind load balancers, in private subnets"""
+    # EC2 instances serving web traffic should be behind load balancers
     if model.ec2_instances and not model.load_balancers:
         warnings.append(SecurityWarning(
             severity="LOW",
@@ -106,16 +205,7 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
             recommendation="Use a load balancer for better availability, scalability, and security"
         ))
     
-    # Check 6: Warn about default credentials in RDS (from terraform.py)
-    if model.rds_databases:
-        warnings.append(SecurityWarning(
-            severity="MEDIUM",  # Changed from HIGH to allow RDS creation
-            resource="RDS Databases",
-            message="Database credentials may be using default/hardcoded values",
-            recommendation="Use AWS Secrets Manager or Parameter Store for database credentials in production"
-        ))
-    
-    # Check 7: Ensure EC2 instances in public subnets have a specific purpose
+    # EC2 instances in public subnets should have a specific purpose
     public_ec2_count = 0
     for ec2 in model.ec2_instances:
         subnet = model.get_subnet_by_id(ec2.subnet_id)
@@ -129,8 +219,21 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
             message=f"{public_ec2_count} EC2 instance(s) in public subnet with load balancer present",
             recommendation="Consider moving application servers to private subnets and only expose them via load balancer"
         ))
-    
-    # Check 8: VPC CIDR should not overlap with common private ranges
+
+
+def _check_rds_credentials(model: InfrastructureModel, warnings: SecurityReport):
+    """Warn about default credentials in RDS (from terraform.py)"""
+    if model.rds_databases:
+        warnings.append(SecurityWarning(
+            severity="MEDIUM",  # Changed from HIGH to allow RDS creation
+            resource="RDS Databases",
+            message="Database credentials may be using default/hardcoded values",
+            recommendation="Use AWS Secrets Manager or Parameter Store for database credentials in production"
+        ))
+
+
+def _check_vpc_cidr(model: InfrastructureModel, warnings: SecurityReport):
+    """VPC CIDR should not overlap with common home-network ranges"""
     for vpc in model.vpcs:
         if vpc.cidr.startswith("192.168."):
             warnings.append(SecurityWarning(
@@ -139,25 +242,29 @@ def validate_security(model: InfrastructureModel) -> List[SecurityWarning]:
                 message="VPC uses 192.168.x.x range which may conflict with home networks",
                 recommendation="Consider using 10.x.x.x or 172.16-31.x.x ranges for better compatibility"
             ))
-    
-    return warnings
 
 
-def generate_security_report(warnings: List[SecurityWarning]) -> str:
+def generate_security_report(report: Iterable[SecurityWarning]) -> str:
     """
-    Generate a human-readable security report from warnings.
+    Generate a human-readable security report.
+
+    Accepts a SecurityReport or any flat iterable of SecurityWarning (the
+    Terraform edit path aggregates warnings across operations into a plain
+    list); flat input is re-bucketed by severity here.
     """
-    if not warnings:
+    if not isinstance(report, SecurityReport):
+        flat = report
+        report = SecurityReport()
+        for warning in flat:
+            report.append(warning)
+
+    if not report:
         return "✅ No security warnings found. Infrastructure follows best practices."
     
-    lines = [f"⚠️  Found {len(warnings)} security warning(s):\n"]
-    
-    # Group by severity
-    high = [w for w in warnings if w.severity == "HIGH"]
-    medium = [w for w in warnings if w.severity == "MEDIUM"]
-    low = [w for w in warnings if w.severity == "LOW"]
+    lines = [f"⚠️  Found {len(report)} security warning(s):\n"]
     
-    for severity, warning_list in [("HIGH", high), ("MEDIUM", medium), ("LOW", low)]:
+    # Already bucketed by severity at collection time
+    for severity, warning_list in [("HIGH", report.high), ("MEDIUM", report.medium), ("LOW", report.low)]:
         if warning_list:
             lines.append(f"\n{severity} SEVERITY ({len(warning_list)}):")
             for w in warning_list:
@@ -4,8 +4,29 @@ Converts InfrastructureModel to Terraform IaC code.
 This reads from the model, never directly from text or diagrams.
 """
 
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 from .model import InfrastructureModel, SubnetType, NATGateway, VPCFlowLogs
 
+# Rendered Terraform cached on content like the diagram renderer. The header
+# embeds model_id and last_edit_source, which content_hash deliberately
+# ignores, so both join the cache key.
+_TF_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_TF_CACHE_MAX = 128
+_TF_LOCK = threading.Lock()  # Endpoints share a thread pool; LRU ops aren't atomic
+
+
+@lru_cache(maxsize=1024)
+def _tf_name(resource_id: str) -> str:
+    """Terraform-safe identifier for a model resource id (dashes -> underscores).
+
+    Cached because the same ids are re-formatted many times per render (a VPC
+    id alone appears in every subnet, route table and gateway block).
+    """
+    return resource_id.replace('-', '_')
+
 
 def generate_terraform_code(model: InfrastructureModel) -> str:
     """
@@ -20,6 +41,13 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         # infra_id: resource-id  <- Maps back to model resource
         # editable: property     <- Marks safe-to-edit fields
     """
+    cache_key = f"{model.content_hash()}:{model.model_id}:{model.last_edit_source.value}"
+    with _TF_LOCK:
+        cached = _TF_CACHE.get(cache_key)
+        if cached is not None:
+            _TF_CACHE.move_to_end(cache_key)
+            return cached
+
     lines = [
         "# Terraform Infrastructure as Code",
         "# Generated from Infrastructure Model",
@@ -48,7 +76,7 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
     # Generate VPCs
     for vpc in model.vpcs:
         lines.append(f"# infra_id: {vpc.id}")
-        lines.append(f"resource \"aws_vpc\" \"{vpc.id.replace('-', '_')}\" {{")
+        lines.append(f"resource \"aws_vpc\" \"{_tf_name(vpc.id)}\" {{")
         lines.append(f"  cidr_block           = \"{vpc.cidr}\"")
         lines.append(f"  enable_dns_hostnames = true")
         lines.append(f"  enable_dns_support   = true")
@@ -63,8 +91,8 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         has_public = any(s.subnet_type == SubnetType.PUBLIC for s in vpc.subnets)
         if has_public:
             lines.append(f"# Internet Gateway for {vpc.id}")
-            lines.append(f"resource \"aws_internet_gateway\" \"{vpc.id.replace('-', '_')}_igw\" {{")
-            lines.append(f"  vpc_id = aws_vpc.{vpc.id.replace('-', '_')}.id")
+            lines.append(f"resource \"aws_internet_gateway\" \"{_tf_name(vpc.id)}_igw\" {{")
+            lines.append(f"  vpc_id = aws_vpc.{_tf_name(vpc.id)}.id")
             lines.append(f"")
             lines.append(f"  tags = {{")
             lines.append(f"    Name = \"{vpc.name}-igw\"")
@@ -75,8 +103,8 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         # Generate Subnets
         for subnet in vpc.subnets:
             lines.append(f"# infra_id: {subnet.id}")
-            lines.append(f"resource \"aws_subnet\" \"{subnet.id.replace('-', '_')}\" {{")
-            lines.append(f"  vpc_id            = aws_vpc.{vpc.id.replace('-', '_')}.id")
+            lines.append(f"resource \"aws_subnet\" \"{_tf_name(subnet.id)}\" {{")
+            lines.append(f"  vpc_id            = aws_vpc.{_tf_name(vpc.id)}.id")
             lines.append(f"  cidr_block        = \"{subnet.cidr}\"")
             lines.append(f"  availability_zone = \"{subnet.availability_zone}\"")
             
@@ -94,12 +122,12 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
             # Generate Route Table for public subnets
             if subnet.subnet_type == SubnetType.PUBLIC:
                 lines.append(f"# Route Table for {subnet.id}")
-                lines.append(f"resource \"aws_route_table\" \"{subnet.id.replace('-', '_')}_rt\" {{")
-                lines.append(f"  vpc_id = aws_vpc.{vpc.id.replace('-', '_')}.id")
+                lines.append(f"resource \"aws_route_table\" \"{_tf_name(subnet.id)}_rt\" {{")
+                lines.append(f"  vpc_id = aws_vpc.{_tf_name(vpc.id)}.id")
                 lines.append(f"")
                 lines.append(f"  route {{")
                 lines.append(f"    cidr_block = \"0.0.0.0/0\"")
-                lines.append(f"    gateway_id = aws_internet_gateway.{vpc.id.replace('-', '_')}_igw.id")
+                lines.append(f"    gateway_id = aws_internet_gateway.{_tf_name(vpc.id)}_igw.id")
                 lines.append(f"  }}")
                 lines.append(f"")
                 lines.append(f"  tags = {{")
@@ -108,9 +136,9 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
                 lines.append(f"}}")
                 lines.append("")
                 
-                lines.append(f"resource \"aws_route_table_association\" \"{subnet.id.replace('-', '_')}_rta\" {{")
-                lines.append(f"  subnet_id      = aws_subnet.{subnet.id.replace('-', '_')}.id")
-                lines.append(f"  route_table_id = aws_route_table.{subnet.id.replace('-', '_')}_rt.id")
+                lines.append(f"resource \"aws_route_table_association\" \"{_tf_name(subnet.id)}_rta\" {{")
+                lines.append(f"  subnet_id      = aws_subnet.{_tf_name(subnet.id)}.id")
+                lines.append(f"  route_table_id = aws_route_table.{_tf_name(subnet.id)}_rt.id")
                 lines.append(f"}}")
                 lines.append("")
                 # Generate NAT Gateways and Elastic IPs
@@ -128,9 +156,9 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
                     else:
                         nat_eip_ref = f"\"{nat.elastic_ip}\""
                     lines.append(f"# NAT Gateway {nat.id}")
-                    lines.append(f"resource \"aws_nat_gateway\" \"{nat.id.replace('-', '_')}\" {{")
+                    lines.append(f"resource \"aws_nat_gateway\" \"{_tf_name(nat.id)}\" {{")
                     lines.append(f"  allocation_id = {nat_eip_ref}")
-                    lines.append(f"  subnet_id     = aws_subnet.{nat.subnet_id.replace('-', '_')}.id")
+                    lines.append(f"  subnet_id     = aws_subnet.{_tf_name(nat.subnet_id)}.id")
                     lines.append(f"  tags = {{")
                     lines.append(f"    Name = \"{nat.name}\"")
                     lines.append(f"  }}")
@@ -144,11 +172,11 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
                             nat = next((n for n in nat_gateways if n.subnet_id.startswith('subnet-public')), None)
                             if nat:
                                 lines.append(f"# Private route via NAT for {subnet.id}")
-                                lines.append(f"resource \"aws_route_table\" \"{subnet.id.replace('-', '_')}_rt\" {{")
-                                lines.append(f"  vpc_id = aws_vpc.{vpc.id.replace('-', '_')}.id")
+                                lines.append(f"resource \"aws_route_table\" \"{_tf_name(subnet.id)}_rt\" {{")
+                                lines.append(f"  vpc_id = aws_vpc.{_tf_name(vpc.id)}.id")
                                 lines.append(f"  route {{")
                                 lines.append(f"    cidr_block = \"0.0.0.0/0\"")
-                                lines.append(f"    nat_gateway_id = aws_nat_gateway.{nat.id.replace('-', '_')}.id")
+                                lines.append(f"    nat_gateway_id = aws_nat_gateway.{_tf_name(nat.id)}.id")
                                 lines.append(f"  }}")
                                 lines.append(f"")
                                 lines.append(f"  tags = {{")
@@ -156,9 +184,9 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
                                 lines.append(f"  }}")
                                 lines.append(f"}}")
                                 lines.append("")
-                                lines.append(f"resource \"aws_route_table_association\" \"{subnet.id.replace('-', '_')}_rta\" {{")
-                                lines.append(f"  subnet_id      = aws_subnet.{subnet.id.replace('-', '_')}.id")
-                                lines.append(f"  route_table_id = aws_route_table.{subnet.id.replace('-', '_')}_rt.id")
+                                lines.append(f"resource \"aws_route_table_association\" \"{_tf_name(subnet.id)}_rta\" {{")
+                                lines.append(f"  subnet_id      = aws_subnet.{_tf_name(subnet.id)}.id")
+                                lines.append(f"  route_table_id = aws_route_table.{_tf_name(subnet.id)}_rt.id")
                                 lines.append(f"}}")
                                 lines.append("")
     
@@ -166,10 +194,10 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
     flow_logs = getattr(model, 'flow_logs', [])
     for fl in flow_logs:
         lines.append(f"# VPC Flow Log {fl.id}")
-        lines.append(f"resource \"aws_flow_log\" \"{fl.id.replace('-', '_')}\" {{")
+        lines.append(f"resource \"aws_flow_log\" \"{_tf_name(fl.id)}\" {{")
         lines.append(f"  log_group_name = \"{fl.log_group_name or fl.id}\"")
         lines.append(f"  traffic_type   = \"{fl.traffic_type}\"")
-        lines.append(f"  vpc_id         = aws_vpc.{fl.vpc_id.replace('-', '_')}.id")
+        lines.append(f"  vpc_id         = aws_vpc.{_tf_name(fl.vpc_id)}.id")
         lines.append(f"  log_destination_type = \"{fl.log_destination_type}\"")
         lines.append(f"  tags = {{")
         lines.append(f"    Name = \"{fl.id}\"")
@@ -184,7 +212,7 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         lines.append(f"  name        = \"ec2-security-group\"")
         lines.append(f"  description = \"Security group for EC2 instances\"")
         if model.vpcs:
-            lines.append(f"  vpc_id      = aws_vpc.{model.vpcs[0].id.replace('-', '_')}.id")
+            lines.append(f"  vpc_id      = aws_vpc.{_tf_name(model.vpcs[0].id)}.id")
         lines.append(f"")
         lines.append(f"  ingress {{")
         lines.append(f"    from_port   = 80")
@@ -212,12 +240,12 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
     # Generate EC2 Instances
     for ec2 in model.ec2_instances:
         lines.append(f"# infra_id: {ec2.id}")
-        lines.append(f"resource \"aws_instance\" \"{ec2.id.replace('-', '_')}\" {{")
+        lines.append(f"resource \"aws_instance\" \"{_tf_name(ec2.id)}\" {{")
         lines.append(f"  ami           = \"{ec2.ami}\"")
         lines.append(f"  # editable: instance_type")
         lines.append(f"  instance_type = \"{ec2.instance_type.value}\"")
         lines.append(f"  # editable: subnet_id")
-        lines.append(f"  subnet_id     = aws_subnet.{ec2.subnet_id.replace('-', '_')}.id")
+        lines.append(f"  subnet_id     = aws_subnet.{_tf_name(ec2.subnet_id)}.id")
         lines.append(f"  vpc_security_group_ids = [aws_security_group.ec2_sg.id]")
         lines.append(f"")
         lines.append(f"  tags = {{")
@@ -230,9 +258,9 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
     for rds in model.rds_databases:
         # Create DB Subnet Group
         lines.append(f"# DB Subnet Group for {rds.id}")
-        lines.append(f"resource \"aws_db_subnet_group\" \"{rds.id.replace('-', '_')}_subnet_group\" {{")
+        lines.append(f"resource \"aws_db_subnet_group\" \"{_tf_name(rds.id)}_subnet_group\" {{")
         lines.append(f"  name       = \"{rds.name}-subnet-group\"")
-        subnet_refs = [f"aws_subnet.{sid.replace('-', '_')}.id" for sid in rds.subnet_ids]
+        subnet_refs = [f"aws_subnet.{_tf_name(sid)}.id" for sid in rds.subnet_ids]
         lines.append(f"  subnet_ids = [{', '.join(subnet_refs)}]")
         lines.append(f"")
         lines.append(f"  tags = {{")
@@ -243,14 +271,14 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         
         # Create RDS instance
         lines.append(f"# infra_id: {rds.id}")
-        lines.append(f"resource \"aws_db_instance\" \"{rds.id.replace('-', '_')}\" {{")
+        lines.append(f"resource \"aws_db_instance\" \"{_tf_name(rds.id)}\" {{")
         lines.append(f"  identifier           = \"{rds.name}\"")
         lines.append(f"  engine               = \"{rds.engine.value}\"")
         lines.append(f"  # editable: instance_class")
         lines.append(f"  instance_class       = \"{rds.instance_class}\"")
         lines.append(f"  # editable: allocated_storage")
         lines.append(f"  allocated_storage    = {rds.allocated_storage}")
-        lines.append(f"  db_subnet_group_name = aws_db_subnet_group.{rds.id.replace('-', '_')}_subnet_group.name")
+        lines.append(f"  db_subnet_group_name = aws_db_subnet_group.{_tf_name(rds.id)}_subnet_group.name")
         lines.append(f"  skip_final_snapshot  = true")
         lines.append(f"")
         lines.append(f"  # Credentials should be managed via AWS Secrets Manager in production")
@@ -266,11 +294,11 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
     # Generate Load Balancers
     for lb in model.load_balancers:
         lines.append(f"# infra_id: {lb.id}")
-        lines.append(f"resource \"aws_lb\" \"{lb.id.replace('-', '_')}\" {{")
+        lines.append(f"resource \"aws_lb\" \"{_tf_name(lb.id)}\" {{")
         lines.append(f"  name               = \"{lb.name}\"")
         lines.append(f"  internal           = false")
         lines.append(f"  load_balancer_type = \"application\"")
-        subnet_refs = [f"aws_subnet.{sid.replace('-', '_')}.id" for sid in lb.subnet_ids]
+        subnet_refs = [f"aws_subnet.{_tf_name(sid)}.id" for sid in lb.subnet_ids]
         lines.append(f"  subnets            = [{', '.join(subnet_refs)}]")
         lines.append(f"")
         lines.append(f"  tags = {{")
@@ -282,22 +310,27 @@ def generate_terraform_code(model: InfrastructureModel) -> str:
         # Create Target Group
         if lb.target_instance_ids:
             lines.append(f"# Target Group for {lb.id}")
-            lines.append(f"resource \"aws_lb_target_group\" \"{lb.id.replace('-', '_')}_tg\" {{")
+            lines.append(f"resource \"aws_lb_target_group\" \"{_tf_name(lb.id)}_tg\" {{")
             lines.append(f"  name     = \"{lb.name}-tg\"")
             lines.append(f"  port     = 80")
             lines.append(f"  protocol = \"HTTP\"")
             if model.vpcs:
-                lines.append(f"  vpc_id   = aws_vpc.{model.vpcs[0].id.replace('-', '_')}.id")
+                lines.append(f"  vpc_id   = aws_vpc.{_tf_name(model.vpcs[0].id)}.id")
             lines.append(f"}}")
             lines.append("")
             
             # Attach instances to target group
             for target_id in lb.target_instance_ids:
-                lines.append(f"resource \"aws_lb_target_group_attachment\" \"{lb.id.replace('-', '_')}_{target_id.replace('-', '_')}\" {{")
-                lines.append(f"  target_group_arn = aws_lb_target_group.{lb.id.replace('-', '_')}_tg.arn")
-                lines.append(f"  target_id        = aws_instance.{target_id.replace('-', '_')}.id")
+                lines.append(f"resource \"aws_lb_target_group_attachment\" \"{_tf_name(lb.id)}_{_tf_name(target_id)}\" {{")
+                lines.append(f"  target_group_arn = aws_lb_target_group.{_tf_name(lb.id)}_tg.arn")
+                lines.append(f"  target_id        = aws_instance.{_tf_name(target_id)}.id")
                 lines.append(f"  port             = 80")
                 lines.append(f"}}")
                 lines.append("")
     
-    return "\n".join(lines)
+    rendered = "\n".join(lines)
+    with _TF_LOCK:
+        _TF_CACHE[cache_key] = rendered
+        if len(_TF_CACHE) > _TF_CACHE_MAX:
+            _TF_CACHE.popitem(last=False)  # Evict least-recently-used entry
+    return rendered
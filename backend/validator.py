@@ -102,10 +102,10 @@ def enforce_required_subnets(model: InfrastructureModel, result: ValidationResul
         return model  # Will be fixed by enforce_single_vpc
     
     vpc = model.vpcs[0]
-    
+    public_subnets, private_subnets = vpc.partition_subnets()
+
     # Check for public subnet
-    has_public = any(s.subnet_type == SubnetType.PUBLIC for s in vpc.subnets)
-    if not has_public:
+    if not public_subnets:
         print("⚠️ [Validator] No public subnet found, creating one")
         public_subnet = Subnet(
             id="subnet-public-1",
@@ -118,7 +118,6 @@ def enforce_required_subnets(model: InfrastructureModel, result: ValidationResul
         result.add_correction("Created public subnet (10.0.1.0/24) - required for internet-facing resources")
     
     # Check for private subnets (need at least 2 for RDS multi-AZ)
-    private_subnets = [s for s in vpc.subnets if s.subnet_type == SubnetType.PRIVATE]
     if len(private_subnets) == 0:
         print("⚠️ [Validator] No private subnets found, creating two (multi-AZ)")
         private_subnet_1 = Subnet(
@@ -164,11 +163,11 @@ def enforce_resource_placement(model: InfrastructureModel, result: ValidationRes
         return model
     
     vpc = model.vpcs[0]
-    
+
     # Get first public and private subnets
-    public_subnet = next((s for s in vpc.subnets if s.subnet_type == SubnetType.PUBLIC), None)
-    private_subnets = [s for s in vpc.subnets if s.subnet_type == SubnetType.PRIVATE]
-    
+    public_subnets, private_subnets = vpc.partition_subnets()
+    public_subnet = public_subnets[0] if public_subnets else None
+
     if not public_subnet or not private_subnets:
         return model  # Will be fixed by enforce_required_subnets
     
@@ -223,9 +222,9 @@ def enforce_network_boundaries(model: InfrastructureModel, result: ValidationRes
     
     vpc = model.vpcs[0]
     valid_subnet_ids = {s.id for s in vpc.subnets}
-    
-    public_subnet = next((s for s in vpc.subnets if s.subnet_type == SubnetType.PUBLIC), None)
-    private_subnets = [s for s in vpc.subnets if s.subnet_type == SubnetType.PRIVATE]
+
+    public_subnets, private_subnets = vpc.partition_subnets()
+    public_subnet = public_subnets[0] if public_subnets else None
     
     # Fix EC2 instances with invalid subnet_id
     for ec2 in model.ec2_instances:
@@ -264,8 +263,8 @@ def enforce_nat_and_flow_logs(model: InfrastructureModel, result: ValidationResu
         return model
     vpc = model.vpcs[0]
     # Identify subnets
-    public_subnet = next((s for s in vpc.subnets if s.subnet_type == SubnetType.PUBLIC), None)
-    private_subnets = [s for s in vpc.subnets if s.subnet_type == SubnetType.PRIVATE]
+    public_subnets, private_subnets = vpc.partition_subnets()
+    public_subnet = public_subnets[0] if public_subnets else None
     # Ensure NAT Gateway
     nat_gateways = getattr(model, 'nat_gateways', [])
     if private_subnets and not nat_gateways:
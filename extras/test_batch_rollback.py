@@ -0,0 +1,84 @@
+"""
+Regression test for batched Terraform edit rollback.
+
+A batch that fails mid-way must leave the original model completely
+untouched: apply_operations runs against a private copy, so no prefix of
+a failed batch may leak into the caller's model (or the model store).
+
+Runs against the backend package directly - no server needed:
+    python extras/test_batch_rollback.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.parser import parse_text_to_model
+from backend.validator import validate_and_fix
+from backend.edits import apply_operations
+from backend.model import EditSource
+
+
+def build_model():
+    """Parse and validate a small model with an EC2 instance to edit"""
+    model, _ = validate_and_fix(parse_text_to_model(
+        "Create a VPC with an EC2 instance and a load balancer."
+    ))
+    return model
+
+
+def test_failed_batch_leaves_model_untouched():
+    """A valid op followed by a failing op must change nothing"""
+    print("\n" + "=" * 80)
+    print("TEST 1: Failed batch leaves the original model untouched")
+    print("=" * 80)
+
+    model = build_model()
+    ec2 = model.ec2_instances[0]
+    original_id = model.model_id
+    original_hash = model.content_hash()
+    original_type = ec2.instance_type
+
+    operations = [
+        {"operation": "update_resource_property", "resource_id": ec2.id,
+         "property": "instance_type", "value": "t2.small"},
+        {"operation": "remove_resource", "resource_id": "does-not-exist"},
+    ]
+    result = apply_operations(model, operations, EditSource.TERRAFORM)
+
+    assert not result.success, "batch with a failing op must fail"
+    assert model.model_id == original_id, "model_id must not be bumped"
+    assert model.content_hash() == original_hash, "no op may leak into the model"
+    assert ec2.instance_type is original_type, "prefix op must not stay applied"
+    print("[OK] Failed batch rolled back completely")
+
+
+def test_successful_batch_returns_edited_copy():
+    """A fully valid batch returns an edited copy, original unchanged"""
+    print("\n" + "=" * 80)
+    print("TEST 2: Successful batch returns an edited copy")
+    print("=" * 80)
+
+    model = build_model()
+    ec2 = model.ec2_instances[0]
+    original_hash = model.content_hash()
+
+    operations = [
+        {"operation": "update_resource_property", "resource_id": ec2.id,
+         "property": "instance_type", "value": "t2.small"},
+    ]
+    result = apply_operations(model, operations, EditSource.TERRAFORM)
+
+    assert result.success, result.error
+    assert result.model is not model, "success must return the edited copy"
+    assert model.content_hash() == original_hash, "original must stay unchanged"
+    edited = result.model.ec2_instances[0]
+    assert edited.instance_type.value == "t2.small", "copy must carry the edit"
+    print("[OK] Edited copy returned; original untouched")
+
+
+if __name__ == "__main__":
+    test_failed_batch_leaves_model_untouched()
+    test_successful_batch_returns_edited_copy()
+    print("\nAll batch rollback tests passed")